@@ -1,10 +1,12 @@
 # python standard modules
 import asyncio
 import json
-from urllib import request
+from urllib.error import HTTPError
 
 # TwitchPy modules
+from .Cache import ResponseCache
 from .errors import *
+from .HTTP import HTTPClient
 from .utilities import *
 
 
@@ -27,6 +29,17 @@ class Helix:
         The bot's client ID.
 
 
+    Attributes
+    -------------
+    http : HTTP.HTTPClient
+        Sends the requests. Keeps connections to twitch open between requests so that they don't each need a new
+        one, and gives up on a request after http.timeout seconds (10 by default).
+
+    cache : Cache.ResponseCache
+        Keeps responses from get_endpoint() for a while so the same endpoint isn't requested over and over.
+        Set to None to always send a request.
+
+
     Note
     -------------
     You should't have to make an instance of this class.
@@ -43,9 +56,11 @@ class Helix:
         # variables made
         self.base_url = 'https://api.twitch.tv/helix'
         self.broadcaster_id = None
+        self.http = HTTPClient()
+        self.cache = ResponseCache()
 
         # additional setup
-        asyncio.run(self._test_connection())    # test first to avoid an indexerror due to invalid broadcaster name
+        asyncio.run(self._first_test())     # test first to avoid an indexerror due to invalid broadcaster name
 
         # log
         asyncio.run(self.logger.log(11, 'init', 'successfully intialized API'))
@@ -63,7 +78,7 @@ class Helix:
         """
         await self.logger.log(11, 'init', 'testing API credentials...')
 
-        response = await self.get_endpoint(f'/users?login={self.broadcaster_name}')
+        response = await self.get_endpoint(f'/users?login={self.broadcaster_name}', cache=False)
         if 'status' in response:
             if response['status'] == 401:
                 await self.logger.log(40, 'error', f'{response}')
@@ -80,11 +95,33 @@ class Helix:
 
 
 
+    async def _first_test(self):
+        """
+        tests the credentials from __init__(), then closes the connections it opened since their event loop is about to close
+        """
+        try:
+            await self._test_connection()
+        finally:
+            await self.http.close()
+
+
+
+    async def close(self):
+        """Closes the connections to twitch that are being kept open.
+
+        TwitchBot.Client.run() calls this when the bot shuts down.
+        """
+        await self.http.close()
+
+
+
 
-    async def get_endpoint(self, endpoint: str) -> dict:
+    async def get_endpoint(self, endpoint: str, cache: bool=True) -> dict:
         """Lets you get any endpoint in the API.
 
-        Also translates the response into a dict via json.
+        Also translates the response into a dict via json. Doesn't block the event loop while it waits for twitch,
+        so the bot keeps reading chat in the meantime. Responses are kept for a while in Helix.cache, so asking for
+        the same endpoint again soon after (or while it's still being requested) doesn't send another request.
         Reference: https://dev.twitch.tv/docs/api/reference
 
 
@@ -101,6 +138,9 @@ class Helix:
 
                 BAD   'https:api.twitch.tv/helix/user?login=someviewer'
 
+        cache : bool (optional)
+            False to always send a new request instead of using a kept response. Defaults to True.
+
 
         Returns
         ------------
@@ -112,14 +152,25 @@ class Helix:
         -------------
         TypeError
             Raised if endpoint parameter is not a string
+
+        asyncio.TimeoutError
+            Raised if twitch took longer than http.timeout seconds to respond.
+
+        OSError
+            Raised if twitch couldn't be reached.
         """
         # input sanitization
         if (err_msg := check_param(endpoint, str)):
             raise TypeError(f'TwitchPy.API.Helix.get_endpoint(): {err_msg}')
 
-        await self.logger.log(9, 'request_get', f'GET: {self.base_url}{endpoint}')
-        req = request.Request(f'{self.base_url}{endpoint}', headers=self.header)
-        response = json.loads(request.urlopen(req).read().decode())
+        async def fetch():
+            await self.logger.log(9, 'request_get', f'GET: {self.base_url}{endpoint}')
+            return await self.http.request('GET', f'{self.base_url}{endpoint}', headers=self.header)
+
+        if cache and self.cache is not None:
+            response = json.loads((await self.cache.get(endpoint, fetch)).body)
+        else:
+            response = json.loads((await fetch()).body)
         await self.logger.log(9, 'request_response', f'response: {response}')
         return response
 
@@ -236,6 +287,12 @@ class Helix:
             A list of strings whose elements are users in chat.
 
 
+        Raises
+        -------------
+        urllib.error.HTTPError
+            Raised if twitch didn't respond with 200 OK.
+
+
         Note
         --------
         An example of what we get: ``{"_links": {}, "chatter_count": 1, "chatters": {"broadcaster": ["broadcaster username"], "vips": [],
@@ -248,7 +305,12 @@ class Helix:
         """
         await self.logger.log(19, 'basic', 'getting viewers')
         await self.logger.log(9, 'request_get', f'GET tmi.twitch.tv/group/user/{self.broadcaster_name}/chatters')
-        response = json.loads(request.urlopen(f'https://tmi.twitch.tv/group/user/{self.broadcaster_name}/chatters').read().decode())
+        url = f'https://tmi.twitch.tv/group/user/{self.broadcaster_name}/chatters'
+        response = await self.http.request('GET', url)
+        if response.status != 200:  # the error body isn't a list of chatters, so don't try to read it as one
+            await self.logger.log(40, 'error', f'failed to get viewers: {response.status} {response.reason}')
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        response = json.loads(response.body)
         await self.logger.log(9, 'request_response', f'response: {response}')
 
         simple_response = []
@@ -0,0 +1,192 @@
+# python standard modules
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+
+
+
+"""
+caches responses from twitch's API so the same request made over and over (like when a lot of viewers use
+the same command at once) only goes to twitch once in a while
+"""
+
+
+
+__all__ = ['ResponseCache']
+
+
+
+class ResponseCache:
+    """Holds on to API responses for a while so that asking for the same endpoint again doesn't send another request.
+
+    Each endpoint's response is kept for as many seconds as its path is given in ttls (ttl if it isn't there).
+    Once there are more than max_entries responses or they add up to more than max_bytes, the ones that have gone
+    the longest without being used are thrown out first.
+
+    If an endpoint is asked for while a request for it is already on its way, the second caller waits for that
+    request instead of sending its own, so 50 viewers using the same command at once only send one request.
+    Only successful (200) responses are kept, but every caller waiting on a request gets its response either way.
+
+
+    Parameters
+    ------------
+    ttl : float (optional)
+        How many seconds to keep the response of an endpoint that isn't in ttls. Defaults to 30.
+
+    max_entries : int (optional)
+        The most responses to keep. Defaults to 256.
+
+    max_bytes : int (optional)
+        The most bytes of response bodies to keep. Defaults to 1048576 (1 MiB).
+
+
+    Attributes
+    ------------
+    See parameters
+
+    ttls : {str: float}
+        How many seconds to keep responses, by endpoint path (the part before '?'). 0 means never keep them.
+        ex: {'/users': 300, '/streams': 10}
+
+    hits : int
+        How many times a kept response was used instead of sending a request.
+
+    misses : int
+        How many times a request had to be sent.
+
+    shared : int
+        How many times a request already on its way was waited for instead of sending another.
+
+    evictions : int
+        How many responses were thrown out to make room for newer ones.
+
+    expired : int
+        How many responses were thrown out because they were kept for longer than their ttl.
+    """
+    def __init__(self, ttl: float=30, max_entries: int=256, max_bytes: int=1048576):
+        # variables given
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # variables created
+        self.ttls = {
+            '/users': 300,          # names, ids, and descriptions rarely change
+            '/users/follows': 60,
+            '/streams': 10,         # viewer counts and whether the stream is live
+        }
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+        self.expired = 0
+        self._entries = OrderedDict()   # {endpoint: (when it expires, HTTP.Response)} least recently used first
+        self._bytes = 0
+        self._inflight = dict()         # {endpoint: asyncio.Task} requests that haven't gotten a response yet
+
+
+
+    async def get(self, endpoint: str, fetch):
+        """Gets an endpoint's response, only calling fetch if there isn't one kept and one isn't already on its way.
+
+
+        Parameters
+        ------------
+        endpoint : str
+            ex: '/users?login=someviewer'
+
+        fetch : coroutine function
+            Takes no arguments and sends the request, returning an HTTP.Response
+
+
+        Returns
+        ---------
+        TwitchPy.HTTP.Response
+            The response. Callers share it, so don't change it.
+        """
+        now = time.monotonic()
+        if (entry := self._entries.get(endpoint)) is not None:
+            if entry[0] > now:
+                self.hits += 1
+                self._entries.move_to_end(endpoint)
+                return entry[1]
+            self._drop(endpoint)
+            self.expired += 1
+
+        task = self._inflight.get(endpoint)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.shared += 1
+        else:
+            self.misses += 1
+            # its own task so a caller being cancelled doesn't cancel the request for everyone else waiting on it
+            task = self._inflight[endpoint] = asyncio.ensure_future(fetch())
+            task.add_done_callback(functools.partial(self._store, endpoint))
+        return await asyncio.shield(task)
+
+
+
+    def _store(self, endpoint: str, task: asyncio.Task):
+        """
+        runs when a request finishes, keeping its response if it was successful
+        then throws out the least recently used responses until there's room again
+        """
+        if self._inflight.get(endpoint) is task:
+            del self._inflight[endpoint]
+        if task.cancelled() or task.exception() is not None:   # checking the exception also keeps asyncio from warning that nobody did
+            return
+
+        response = task.result()
+        ttl = self.ttls.get(endpoint.partition('?')[0], self.ttl)
+        if response.status != 200 or ttl <= 0 or len(response.body) > self.max_bytes:
+            return
+        if endpoint in self._entries:
+            self._drop(endpoint)
+        self._entries[endpoint] = (time.monotonic() + ttl, response)
+        self._bytes += len(response.body)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+
+
+    def _drop(self, endpoint: str):
+        self._bytes -= len(self._entries.pop(endpoint)[1].body)
+
+
+
+    def clear(self, endpoint: str=None):
+        """Throws out every kept response, or just the one for endpoint.
+
+
+        Parameters
+        ------------
+        endpoint : str (optional)
+            ex: '/users?login=someviewer'
+        """
+        if endpoint is None:
+            self._entries.clear()
+            self._bytes = 0
+        elif endpoint in self._entries:
+            self._drop(endpoint)
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_stats(self) -> dict:
+        """
+        the hits, misses, shared, evictions, and expired counters, plus how many responses are kept ('entries') and their size ('bytes')
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared': self.shared,
+            'evictions': self.evictions,
+            'expired': self.expired,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        }
\ No newline at end of file
@@ -1,3 +1,8 @@
+# python standard modules
+from collections import deque
+import sys
+import time
+
 # TwitchPy modules
 from .UserInfo import User
 
@@ -7,6 +12,9 @@ from .UserInfo import User
 an object created whenever a viewer sends a message
 which contains information regarding the message like
 the message being sent, who sent it, and whatever else is associated with the message
+
+also objects for the other things twitch tells us about a channel's chat, like subs, bans, and chat settings
+https://dev.twitch.tv/docs/irc/commands
 """
 
 
@@ -20,7 +28,7 @@ class Chat:
     Parameters
     -------------
     channel : str
-        The channel that the bot is connected to.
+        The channel the message was sent in.
 
 
     Attributes
@@ -29,7 +37,7 @@ class Chat:
         See parameters.
 
     tags : dict
-        Tags associated with the message.
+        Tags associated with the message. Only decoded from the raw message the first time you access it.
 
         See https://dev.twitch.tv/docs/irc/tags#privmsg-twitch-tags
 
@@ -53,32 +61,76 @@ class Chat:
 
         ex: ['lorem', 'ipsum']
 
-    author : User
-        Object containing basic information about the viewer who sent the message
+    user : User
+        Object containing basic information about the viewer who sent the message.
+        Only made the first time you access it.
+
+    time : float
+        When the message was received, in seconds since the epoch (see time.time()).
 
 
     Note
     ----------
     You shouldn't have to make an instance of this class.
+
+    Note
+    ----------
+    Most chat messages only get looked at for a command prefix and added to the chat history, so tags,
+    raw_message, and user aren't worked out until something actually uses them.
+
+    Note
+    ----------
+    Chat uses __slots__, so you can't add your own attributes to it.
     """
+    __slots__ = ('channel', 'msg', 'arg_msg', 'args', 'user', 'time', '_message')
+
     def __init__(self, channel: str):
         # variables given
         self.channel = channel
 
         # variables created
-        self.tags = dict()
-        self.raw_message = ''   # the raw message received from twitch
         self.msg = ''           # includes bot prefix and command name
         self.arg_msg = ''       # msg without prefix or command name
-        self.args = []          # arg_msg split by spaces to better access them
-        self.author = None
+        self.time = time.time()
+        self._message = None    # the Parser.Message that tags, raw_message, and user come from
+
+
+
+    def __getattr__(self, name: str):
+        """
+        only called if a slot hasn't been filled yet
+        args and user are made here the first time they're accessed and then saved
+        """
+        if name == 'args':      # arg_msg split by spaces, only set for commands
+            value = []
+        elif name == 'user':
+            value = User._from_message(self._message) if self._message else None
+        else:
+            raise AttributeError(f"'Chat' object has no attribute '{name}'")
+        setattr(self, name, value)
+        return value
+
+
+
+    @property
+    def tags(self) -> dict:
+        return self._message.tags if self._message else dict()
+
 
 
+    @property
+    def raw_message(self) -> str:
+        """
+        the raw message received from twitch
+        """
+        return self._message.raw if self._message else ''
+
 
-    async def _parse(self, raw_message: str):
+
+    async def _parse(self, message):
         """
-        parses a raw message from twitch irc client into readable/iterable data structures
-        basic form of a raw message: <tags> PRIVMSG #<user> :<msg>
+        fills in the chat's information from a Parser.Message of a PRIVMSG line
+        basic form of a raw message: <tags> :<user>!<user>@<user>.tmi.twitch.tv PRIVMSG #<channel> :<msg>
         EXAMPLE FORMATTED RAW MESSAGE (this would all be one line when we get it from twitch)
             @
             badge-info=subscriber/17;
@@ -99,43 +151,8 @@ class Chat:
             PRIVMSG #gay_zach :lorem ipsum
         https://dev.twitch.tv/docs/irc/tags#privmsg-twitch-tags
         """
-        self.raw_message = raw_message
-        msg = raw_message
-        tags = msg[1:msg.find('PRIVMSG ')].split(';')
-        msg = msg[msg.find('PRIVMSG ')+9:]
-        username = msg[:msg.find(':')-1]
-        msg = msg[msg.find(':')+1:-2]
-        self.msg = msg
-
-        for t in tags:
-            key = t[:t.find('=')]
-            val = t[t.find('=')+1:]
-            self.tags[key] = val
-
-        self.user = await self.__create_user()
-
-
-
-    async def __create_user(self) -> User:
-        """
-        creates a user object from the viewer who types in chat
-        contains basic information about them:
-            username
-            user id
-            if they're a broadcaster
-            if they're a moderator
-            if they're a subscriber
-            how long they've been subscribed
-            their chat badges
-        """
-        username = self.tags['display-name']
-        user_id = self.tags['user-id']
-        broadcaster = 'broadcaster' in self.tags['badges']
-        moderator = bool(int(self.tags['mod']))
-        subscriber = bool(int(self.tags['subscriber']))
-        sub_length = int(self.tags['badge-info'][self.tags['badge-info'].find('/')+1:]) if self.tags['subscriber'] else 0
-        badges = self.tags['badges'].split(',')
-        return User(name=username, uid=user_id, broadcaster=broadcaster, moderator=moderator, subscriber=subscriber, sub_length=sub_length, badges=badges)
+        self._message = message
+        self.msg = message.trailing or ''
 
 
 
@@ -159,4 +176,570 @@ class Chat:
         return self.split_args
 
     def get_user(self) -> User:
-        return self.user
\ No newline at end of file
+        return self.user
+
+    def get_time(self) -> float:
+        return self.time
+
+
+
+class ChatHistory:
+    """Holds on to the most recent chat messages, newest first.
+
+    Works like a read-only list: chat_history[0] is the newest message, chat_history[-1] is the oldest,
+    and you can loop over it, slice it, and use len() on it. Adding a message never moves the other
+    messages around, so it takes the same amount of time no matter how big the limit is.
+
+    It also keeps track of which messages came from which viewer and when each message was received,
+    so ChatHistory.from_user() and ChatHistory.within() don't have to look through every message.
+
+
+    Parameters
+    ------------
+    limit : int (optional)
+        The most messages to hold on to. When it's full, the oldest message is dropped to make room for
+        the newest. If None, there is no limit. If 0, no messages are saved at all.
+
+
+    Attributes
+    ------------
+    limit : int
+        See parameters.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class. Use TwitchPy.Websocket.IRC.chat_history for the main
+    channel or TwitchPy.Websocket.IRC.channels[name].chat_history for any channel.
+    """
+    def __init__(self, limit: int=None):
+        # variables given
+        self.limit = limit
+
+        # variables created
+        self._buffer = [None] * limit if limit else []  # messages from oldest to newest, wrapping around once full
+        self._user_ids = [None] * limit if limit else []    # who sent each message in self._buffer, only kept if there's a limit
+        self._start = 0         # where the oldest message is in self._buffer
+        self._size = 0
+        self._by_user = dict()  # {user id: deque([Chat])} oldest to newest
+
+
+
+    def append(self, chat: Chat):
+        """Adds a message as the newest one, dropping the oldest if the history is full.
+
+
+        Parameters
+        ------------
+        chat : TwitchPy.ChatInfo.Chat
+            The message to add.
+        """
+        if self.limit == 0:
+            return
+
+        uid = self._user_id(chat)
+        if self.limit is None:
+            self._buffer.append(chat)
+        else:
+            if self._size == self.limit:
+                # full, so the oldest message is dropped and the newest takes its spot
+                old_uid = self._user_ids[self._start]
+                chats = self._by_user[old_uid]
+                chats.popleft()
+                if not chats:
+                    del self._by_user[old_uid]
+                self._start = (self._start + 1) % self.limit
+                self._size -= 1
+
+            index = (self._start + self._size) % self.limit
+            self._buffer[index] = chat
+            self._user_ids[index] = uid
+
+        self._size += 1
+        chats = self._by_user.get(uid)
+        if chats is None:
+            chats = self._by_user[uid] = deque()
+        chats.append(chat)
+
+
+
+    def from_user(self, user_id: str, count: int=None) -> [Chat]:
+        """Gets the newest messages sent by a viewer.
+
+
+        Parameters
+        ------------
+        user_id : str
+            The user ID of the viewer. See TwitchPy.UserInfo.User.id
+
+        count : int (optional)
+            The most messages to get. If not given, gets every message from that viewer in the history.
+
+
+        Returns
+        ---------
+        [TwitchPy.ChatInfo.Chat]
+            The viewer's messages, newest first.
+        """
+        chats = self._by_user.get(user_id, ())
+        if count is None or count >= len(chats):
+            return list(reversed(chats))
+        return [chats[-i] for i in range(1, count+1)]
+
+
+
+    def within(self, seconds: float) -> [Chat]:
+        """Gets every message received in the last so many seconds.
+
+
+        Parameters
+        ------------
+        seconds : float
+            How far back to go. ex: 60 gets every message from the last minute
+
+
+        Returns
+        ---------
+        [TwitchPy.ChatInfo.Chat]
+            The messages, newest first.
+        """
+        return self.between(time.time() - seconds, float('inf'))
+
+
+
+    def between(self, start: float, end: float) -> [Chat]:
+        """Gets every message received between two times.
+
+
+        Parameters
+        ------------
+        start : float
+            The earliest time, in seconds since the epoch (see time.time()).
+
+        end : float
+            The latest time, in seconds since the epoch.
+
+
+        Returns
+        ---------
+        [TwitchPy.ChatInfo.Chat]
+            The messages, newest first.
+        """
+        # messages are added as they're received, so they're already sorted by time
+        first = self._bisect(start)
+        last = self._bisect(end, right=True)
+        return [self._at(i) for i in range(last-1, first-1, -1)]
+
+
+
+    def clear(self):
+        """Forgets every message.
+        """
+        self._buffer = [None] * self.limit if self.limit else []
+        self._user_ids = [None] * self.limit if self.limit else []
+        self._start = 0
+        self._size = 0
+        self._by_user = dict()
+
+
+
+    def _at(self, index: int) -> Chat:
+        """
+        gets a message by its position from oldest (0) to newest
+        """
+        if self.limit is None:
+            return self._buffer[index]
+        return self._buffer[(self._start + index) % self.limit]
+
+
+
+    def _bisect(self, timestamp: float, right: bool=False) -> int:
+        """
+        finds where timestamp would go among the messages from oldest to newest
+        the same as bisect.bisect_left() or bisect.bisect_right(), which can't take a key before python 3.10
+        """
+        low, high = 0, self._size
+        while low < high:
+            mid = (low + high) // 2
+            msg_time = self._at(mid).time
+            if msg_time < timestamp or (right and msg_time == timestamp):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+
+
+    @staticmethod
+    def _user_id(chat: Chat) -> str:
+        """
+        the user id of whoever sent chat, found without decoding all the tags if they haven't been yet
+        interned so the history only keeps one copy of each viewer's id
+        """
+        if chat._message is not None:
+            return sys.intern(chat._message.get_tag('user-id', ''))
+        return sys.intern(getattr(chat.user, 'id', ''))
+
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('chat history index out of range')
+        return self._at(self._size - 1 - index)    # position 0 is the newest message
+
+
+
+    def __iter__(self):
+        for i in range(self._size-1, -1, -1):
+            yield self._at(i)
+
+
+
+    def __repr__(self):
+        return f'ChatHistory(limit={self.limit!r}, size={self._size})'
+
+
+
+
+
+
+class UserNotice:
+    """Something happened in chat that twitch announces, like a sub, resub, gifted sub, or raid.
+
+    Made from a USERNOTICE line. See Events.Handler.on_usernotice()
+
+
+    Attributes
+    ------------
+    channel : str
+        The channel it happened in.
+
+    kind : str
+        What happened. ex: 'sub', 'resub', 'subgift', 'raid', or 'announcement'
+        See https://dev.twitch.tv/docs/irc/tags#usernotice-tags
+
+    system_msg : str
+        The message twitch shows in chat about it. ex: 'SomeViewer subscribed for 12 months!'
+
+    msg : str
+        The message the viewer sent along with it, if there is one. ex: a resub message
+
+    user : User
+        The viewer it's about.
+
+    tags : dict
+        All of the line's tags.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+    """
+    __slots__ = ('channel', 'kind', 'system_msg', 'msg', 'user', 'tags')
+
+    def __init__(self, message):
+        self.channel = message.channel
+        self.tags = message.tags
+        self.kind = self.tags.get('msg-id', '')
+        self.system_msg = self.tags.get('system-msg', '')
+        self.msg = message.trailing or ''
+        self.user = User._from_message(message, self.tags.get('login'))
+
+
+
+
+
+
+class ClearChat:
+    """A viewer was timed out or banned, or all of chat was cleared.
+
+    Made from a CLEARCHAT line. See Events.Handler.on_clearchat()
+
+
+    Attributes
+    ------------
+    channel : str
+        The channel it happened in.
+
+    username : str
+        The login name of the viewer who was timed out or banned, or None if all of chat was cleared.
+
+    duration : int
+        How many seconds the viewer was timed out for, or None if they were banned (or chat was cleared).
+
+    tags : dict
+        All of the line's tags.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+    """
+    __slots__ = ('channel', 'username', 'duration', 'tags')
+
+    def __init__(self, message):
+        self.channel = message.channel
+        self.tags = message.tags
+        self.username = message.trailing or None
+        duration = self.tags.get('ban-duration', '')
+        self.duration = int(duration) if duration.isdigit() else None
+
+
+
+    @property
+    def banned(self) -> bool:
+        """
+        True if a viewer was banned rather than timed out
+        """
+        return self.username is not None and self.duration is None
+
+
+
+
+
+
+class ClearMsg:
+    """A single chat message was deleted.
+
+    Made from a CLEARMSG line. See Events.Handler.on_clearmsg()
+
+
+    Attributes
+    ------------
+    channel : str
+        The channel it happened in.
+
+    username : str
+        The login name of the viewer whose message was deleted.
+
+    msg : str
+        The message that was deleted.
+
+    target_msg_id : str
+        The id of the message that was deleted, which is the 'id' tag of the original message's Chat.tags
+
+    tags : dict
+        All of the line's tags.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+    """
+    __slots__ = ('channel', 'username', 'msg', 'target_msg_id', 'tags')
+
+    def __init__(self, message):
+        self.channel = message.channel
+        self.tags = message.tags
+        self.username = self.tags.get('login', '')
+        self.msg = message.trailing or ''
+        self.target_msg_id = self.tags.get('target-msg-id', '')
+
+
+
+
+
+
+class RoomState:
+    """A channel's chat settings.
+
+    Made from a ROOMSTATE line. Twitch sends all of the settings when the bot joins a channel, and afterwards
+    only the settings that changed. Settings that weren't part of this update are None.
+    See Events.Handler.on_roomstate()
+
+
+    Attributes
+    ------------
+    channel : str
+        The channel whose settings these are.
+
+    emote_only : bool
+        True if viewers can only send emotes.
+
+    followers_only : int
+        How many minutes a viewer has to have been following to chat. -1 if followers-only mode is off.
+
+    r9k : bool
+        True if messages have to be unique.
+
+    slow : int
+        How many seconds viewers have to wait between messages. 0 if slow mode is off.
+
+    subs_only : bool
+        True if only subscribers can chat.
+
+    tags : dict
+        All of the line's tags.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+    """
+    __slots__ = ('channel', 'emote_only', 'followers_only', 'r9k', 'slow', 'subs_only', 'tags')
+
+    def __init__(self, message):
+        self.channel = message.channel
+        self.tags = tags = message.tags
+        self.emote_only = tags['emote-only'] == '1' if 'emote-only' in tags else None
+        self.followers_only = int(tags['followers-only']) if 'followers-only' in tags else None
+        self.r9k = tags['r9k'] == '1' if 'r9k' in tags else None
+        self.slow = int(tags['slow']) if 'slow' in tags else None
+        self.subs_only = tags['subs-only'] == '1' if 'subs-only' in tags else None
+
+
+
+
+
+
+class Membership:
+    """A viewer joined or left a channel's chat.
+
+    Made from a JOIN or PART line. Twitch only sends these for channels with fewer than 1000 viewers in chat,
+    and groups them together so they might be a few seconds late. See Events.Handler.on_join() and on_part()
+
+
+    Attributes
+    ------------
+    channel : str
+        The channel they joined or left.
+
+    username : str
+        The login name of the viewer.
+
+    joined : bool
+        True if they joined, False if they left.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+    """
+    __slots__ = ('channel', 'username', 'joined')
+
+    def __init__(self, message):
+        self.channel = message.channel
+        self.username = message.nick
+        self.joined = message.command == 'JOIN'
+
+
+
+
+
+
+class Channel:
+    """Everything the bot keeps track of for one channel that it's in.
+
+
+    Parameters
+    ------------
+    name : str
+        The channel's name (without the '#').
+
+    chatlimit : int
+        The most messages chat_history should hold on to. See ChatInfo.ChatHistory
+
+
+    Attributes
+    ------------
+    name : str
+        See parameters.
+
+    chat_history : TwitchPy.ChatInfo.ChatHistory
+        The channel's chat messages, newest first.
+
+    roomstate : TwitchPy.ChatInfo.RoomState
+        The channel's current chat settings, with every update twitch sends merged in.
+        None until twitch sends them, which it does right after the bot joins.
+
+    moderator : bool
+        True if twitch says the bot is a moderator or broadcaster of the channel.
+
+    joined : bool
+        True once twitch says the bot has joined the channel. False while the bot is waiting to join it,
+        including after reconnecting.
+
+    paused : bool
+        While True, chat messages from the channel are ignored: they aren't logged, checked for commands,
+        or saved to chat_history. Defaults to False.
+
+    messages : int
+        How many chat messages the bot has handled from the channel, not counting any while it was paused.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class. See TwitchPy.Websocket.IRC.channels
+    """
+    def __init__(self, name: str, chatlimit: int=None):
+        # variables given
+        self.name = name
+
+        # variables created
+        self.chat_history = ChatHistory(chatlimit)
+        self.roomstate = None
+        self.moderator = False
+        self.joined = False
+        self.paused = False
+        self.messages = 0
+        self._seen = None   # {message id: None} recent message ids while more than one connection gets the channel's messages
+
+
+
+    def _update_roomstate(self, roomstate: RoomState):
+        """
+        twitch only sends the settings that changed after the first ROOMSTATE, so those are copied over the ones we have
+        """
+        if self.roomstate is None:
+            self.roomstate = roomstate
+            return
+        for setting in ['emote_only', 'followers_only', 'r9k', 'slow', 'subs_only']:
+            if (value := getattr(roomstate, setting)) is not None:
+                setattr(self.roomstate, setting, value)
+        self.roomstate.tags = {**self.roomstate.tags, **roomstate.tags}
+
+
+
+    def _is_new(self, msg_id: str) -> bool:
+        """
+        while a channel is being moved between shards, both of them get its messages, so the ids of recent ones are
+        remembered (in a dict shared by both) to only handle each message once
+        """
+        seen = self._seen
+        if seen is None or msg_id is None:
+            return True
+        if msg_id in seen:
+            return False
+        seen[msg_id] = None
+        if len(seen) > 1000:
+            del seen[next(iter(seen))]
+        return True
+
+
+
+    def __repr__(self):
+        return f'Channel(name={self.name!r}, joined={self.joined!r}, messages={len(self.chat_history)})'
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_chat_history(self) -> ChatHistory:
+        return self.chat_history
+
+    def get_roomstate(self) -> RoomState:
+        return self.roomstate
\ No newline at end of file
@@ -4,15 +4,31 @@
 
 
 # python standard modules
+import asyncio
+from collections import deque
 import inspect
 
 # TwitchPy modules
 from .Events import Handler
 from .Logger import Logger
+from .RateLimit import BucketStore
+from .UserInfo import ROLE_BROADCASTER, ROLE_MODERATOR, ROLE_SUBSCRIBER, ROLE_EVERYONE
 from .utilities import *
 
 
 
+# which User.roles bits each permission level allows
+# higher permission levels are allowed to use commands meant for lower ones
+_PERMISSION_MASKS = {
+    'notset': 0,    # only the whitelist, see Command.__init__
+    'everyone': ROLE_BROADCASTER | ROLE_MODERATOR | ROLE_SUBSCRIBER | ROLE_EVERYONE,
+    'subscriber': ROLE_BROADCASTER | ROLE_MODERATOR | ROLE_SUBSCRIBER,
+    'moderator': ROLE_BROADCASTER | ROLE_MODERATOR,
+    'broadcaster': ROLE_BROADCASTER,
+}
+
+
+
 class Cog:
     """A structure to hold commands defined by you.
 
@@ -41,9 +57,12 @@ class Cog:
     prefix : str
         See keyword arguments.
 
-    all_commands : dict
-        A dictionary containing all of your commands whose keys are ('commandname', argcount) and
-        whose values are the Commands.Command objects. What's argcount? see Commands.create() for more info.
+    all_commands : [Commands.Command]
+        All of your commands, sorted so that commands that take more args come first.
+        What's argcount? see Commands.create() for more info.
+
+        If you change the commands after the cog is made, use Cog.add_command() and Cog.remove_command()
+        so that the cog knows to look for them.
 
     logger : Logger.Logger
         See keyword arguments
@@ -113,6 +132,7 @@ class Cog:
         self.all_commands = set()
         self.logger = logger
         self.events = eventhandler
+        self._command_table = dict()    # {name: ((Command for each number of args), Command for any more args than that)}
 
         # additional setup
         self.__init_functions()
@@ -131,103 +151,105 @@ class Cog:
                 obj.instance = self
                 self.all_commands.add(obj)
 
-        self.all_commands = sorted(self.all_commands, key=lambda command: command.func.__code__.co_argcount, reverse=True)
+        self.all_commands = sorted(self.all_commands, key=_priority, reverse=True)
             # sort commands by argcount to make selecting one easier
-            # because they are sorted in reverse, self.choose_command will
+            # because they are sorted in reverse, self._find_command will
             # prioritize the one with more args
             # so if we have two funcs
             #   def func1(arg1, *args):
             #   def func2(arg1, arg2, arg3, *args):
             # and we have 5 args to pass, it'll prefer func2 over func1
+        self._build_command_table()
 
 
 
-    def _init_attributes(self, logger, events):
+    def _build_command_table(self):
         """
-        if the user hasn't given this cog a logger and/or eventhandler, give this cog whatever TwitchBot.Client has
+        makes the table that _choose_command uses to find a command by name and number of args in two lookups
+        every name maps to an arity bucket for each number of args up to the most that any command
+        with that name needs to tell them apart, plus the command to use for any more args than that
+        has to be called again whenever all_commands changes
         """
-        if not self.logger:
-            self.logger = logger
-        if not self.events:
-            self.events = events
+        by_name = dict()
+        for command in self.all_commands:   # already sorted by priority, most args first
+            for name in command.names:
+                by_name.setdefault(name, []).append(command)
 
+        table = dict()
+        for name, commands in by_name.items():
+            # past this many args only commands with *args can be used, and they all take the same ones
+            most = max(command.min_args if command.max_args is None else command.max_args for command in commands)
+            buckets = tuple(next((command for command in commands if command.takes(count)), None) for count in range(most+1))
+            overflow = next((command for command in commands if command.max_args is None), None)
+            table[name] = (buckets, overflow)
+        self._command_table = table
 
 
-    async def _choose_command(self, chat):
-        """
-        determines which command to execute, if any
-        """
-        if not chat.msg.startswith(self.prefix):   # first determine if the bot is even being called
-            await self.events.on_no_cmd(chat)
-            return
 
-        msg = chat.msg[len(self.prefix):]          # remove the prefix from the message
+    def add_command(self, command):
+        """Adds a command to this cog after it's been made.
 
-        for command in self.all_commands:
-            if (command_name := [n for n in command.names if msg.startswith(n)]):   # checks if chat message starts with the command name
-                arg_msg = msg[len(command_name[0])+1:]
-                args = arg_msg.split(' ') if arg_msg else []
+        Commands made with @Commands.create() inside the cog's class are added automatically, so you only
+        need this for commands you make some other way.
 
-                if len(args) >= command.func.__code__.co_argcount-2:   # checks if there are even enough args
-                    chat.arg_msg = arg_msg
-                    chat.args = args
-                    try:
-                        await command.func(command.instance, chat, *args) # attempt to call the function which might fail
-                        await self.events.on_cmd(chat)
-                        return
-                    except TypeError:
-                        # this might happen if we send the command too many args
-                        pass
 
+        Parameters
+        ------------
+        command : Commands.Command
+            The command to add. Its function still has to take self and chat as its first two parameters.
 
-        await self.logger.log(30, 'error', 'unable to find command')
-        await self.events.on_bad_cmd(chat)
 
+        Raises
+        ------------
+        TypeError
+            Raised if command is not a Commands.Command
+        """
+        # input sanitization
+        if (err_msg := check_param(command, Command)):
+            raise TypeError(f'TwitchPy.Commands.Cog.add_command(): {err_msg}')
 
+        command.instance = self
+        commands = set(self.all_commands)
+        commands.add(command)
+        self.all_commands = sorted(commands, key=_priority, reverse=True)
+        self._build_command_table()
 
-    def _check_permissions(self, user, command):
-        """
-        makes sure the viewer has the correct permissions to execute this command.
-        checks both permission level and whitelist (by calling self._check_whitelist())
 
-        arg     user        (required)  the whole UserInfo.User object. this is most likely sent in as chat.user
-        arg     command     (required)  the whole command object. most likely sent in as obj
-        """
-        if command.permission == 'notset':
-            # i know this seems counterintuitive, but that's only because we're going to check this AND _check_whitelist
-            # so if a user defines a command like command(whitelist='someviewer'), then the permission is going to default
-            # to 'everyone'. without this if statement, this function would return True and regardless of the whitelist,
-            # any user could use the command. but with this, the command can only be executed by viewers defined in the whitelist.
-            # this also works if the user defines a command without a permission level or a whitelist
-            return self._check_whitelist(user.name, command.whitelist)
 
-        permission_hierarchy = ['broadcaster', 'moderator', 'subscriber', 'everyone']
+    def remove_command(self, command):
+        """Removes a command from this cog.
 
-        user_level = 3   # everyone. aka: user is not broadcaster, mod, or sub
-        if user.broadcaster:
-            user_level = 0
-        elif user.moderator:
-            user_level = 1
-        elif user.subscriber:
-            user_level = 2
 
-        if user_level <= permission_hierarchy.index(command.permission) or user.name in command.whitelist:
-            return True
+        Parameters
+        ------------
+        command : Commands.Command
+            The command to remove. Nothing happens if the cog doesn't have it.
+        """
+        if command in self.all_commands:
+            self.all_commands = [cmd for cmd in self.all_commands if cmd is not command]
+            self._build_command_table()
 
 
 
-    def _check_whitelist(self, username, whitelist):
+    def _init_attributes(self, logger, events):
+        """
+        if the user hasn't given this cog a logger and/or eventhandler, give this cog whatever TwitchBot.Client has
         """
-        makes sure the user is either in the whitelist or the whitelist doesn't exist
+        if not self.logger:
+            self.logger = logger
+        if not self.events:
+            self.events = events
+
+
 
-        arg     username    (required)  only the UserInfo.User.name portion. most likely sent in as user.name
-        arg     whitelist   (required)  whitelist portion of command. most likely sent in as command.whitelist
+    def _find_command(self, name: str, argcount: int):
         """
-        if not whitelist: # if there is no whitelist, don't sweat it
-            return True
-        if username in whitelist:
-            return True
-        return False
+        finds the command with this name that should be called with this many args, or None if there isn't one
+        """
+        if (entry := self._command_table.get(name)):
+            buckets, overflow = entry
+            return buckets[argcount] if argcount < len(buckets) else overflow
+        return None
 
 
 
@@ -255,34 +277,404 @@ class Command:
         Who is allowed to use this command based on username. If used alongside permission,
         permissions will take precedence over whitelist.
 
+    rate : (int, float) (optional)
+        How many times the command can be used in so many seconds, or None for no limit.
+
+    cooldown_per : {'user', 'channel'} (optional)
+        Whether rate applies to each viewer or the whole channel. Defaults to 'user'.
+
 
     Note
     ------------
     For more information on what these mean, see Commands.create()
 
+    Note
+    ------------
+    whitelist is stored as a lowercase frozenset, since usernames are always lowercase.
+
 
     Attributes
     --------------
     See parameters
 
+    min_args : int
+        The fewest args the command can be called with (not counting self and chat).
+
+    max_args : int
+        The most args the command can be called with, or None if it has *args.
+
+    permission_mask : int
+        Which UserInfo.User.roles bits are allowed to use the command. A viewer can use the command if
+        permission_mask & user.roles isn't 0 or they're in the whitelist.
+
+    cooldowns : RateLimit.BucketStore
+        A token bucket for every viewer (or channel) that's used the command recently, or None if rate isn't set.
+
+
+    Raises
+    ------------
+    TypeError
+        Raised if func doesn't take self and chat, or has keyword-only args without defaults, since
+        TwitchPy would have no way of giving it those.
+
 
     Note
     ---------
     You shouldn't have to make an instance of this class. But it might be useful for you to know
     what attributes this Class has if you plan on making your own command parser.
     """
-    def __init__(self, func, names: [str], permission: str, whitelist: [str]):
+    def __init__(self, func, names: [str], permission: str, whitelist: [str], rate: (int, float)=None, cooldown_per: str='user'):
         self.func = func
         self.names = names
         self.permission = permission
-        self.whitelist = whitelist
+        self.whitelist = frozenset(name.lower() for name in whitelist)
+        self.permission_mask = _PERMISSION_MASKS[permission]
+        if permission == 'notset' and not self.whitelist:
+            self.permission_mask = _PERMISSION_MASKS['everyone']   # no permission or whitelist means anyone can use it
+        self.rate = rate
+        self.cooldown_per = cooldown_per
+        self.cooldowns = BucketStore(*rate) if rate else None
+
+        # worked out once here so picking which command to call never has to try calling one
+        self.min_args = 0
+        self.max_args = 0
+        params = list(inspect.signature(func).parameters.values())
+        positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        if len(positional) < 2:
+            raise TypeError(f"TwitchPy.Commands.Command: '{func.__name__}' must take self and chat as its first two parameters")
+        for param in positional[2:]:     # don't count self and chat
+            self.max_args += 1
+            if param.default is param.empty:
+                self.min_args += 1
+        for param in params:
+            if param.kind == param.VAR_POSITIONAL:
+                self.max_args = None
+            elif param.kind == param.KEYWORD_ONLY and param.default is param.empty:
+                raise TypeError(f"TwitchPy.Commands.Command: '{func.__name__}' can't have keyword-only parameters without defaults like '{param.name}'")
+
+
+
+    def takes(self, argcount: int) -> bool:
+        """Checks if the command can be called with some number of args.
+
+
+        Parameters
+        ------------
+        argcount : int
+            The number of args, not counting self and chat.
+
+
+        Returns
+        ---------
+        bool
+            True if the command's signature accepts that many args.
+        """
+        return self.min_args <= argcount and (self.max_args is None or argcount <= self.max_args)
+
+
+
+
+
+
+class Executor:
+    """Runs commands as their own tasks so a slow command doesn't stop the bot from reading chat.
+
+    Commands from the same viewer are always run one at a time in the order they were sent, while
+    commands from different viewers run at the same time, up to limit at once. Any more than that wait
+    their turn.
+
+
+    Parameters
+    ------------
+    limit : int
+        The most commands that can run at the same time.
+
+
+    Attributes
+    ------------
+    limit : int
+        See parameters.
+
+    in_flight : int
+        How many commands are running right now.
+
+    queued : int
+        How many commands are waiting to run, either because limit commands are already running or
+        because the same viewer has a command that hasn't finished yet.
+
+    completed : int
+        How many commands have finished.
+
+    failed : int
+        How many commands raised an exception.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class. TwitchBot.Client makes one, see Client.get_command_stats()
+
+    Note
+    ------------
+    An exception raised by a command (including TwitchBot.Client.kill()'s ExpectedExit) still stops
+    the bot, even though the command is running as its own task.
+    """
+    def __init__(self, limit: int=10):
+        # variables given
+        self.limit = limit
+
+        # variables created
+        self.in_flight = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self._slots = None      # asyncio.Semaphore, made once the bot is running so it belongs to the right event loop
+        self._users = dict()    # {username: deque([(cog, command, chat)])} for every viewer with a command waiting or running
+        self._tasks = set()     # keeps running tasks from being garbage collected
+        self._error = None      # asyncio.Future that gets the first exception a command raises
+
+
+
+    def submit(self, cog, command, chat):
+        """Schedules a command to run, after any commands the same viewer sent before it.
+
+        Parameters
+        ------------
+        cog : Commands.Cog
+            The cog the command belongs to. on_cmd is called on its event handler once the command finishes.
+
+        command : Commands.Command
+            The command to run.
+
+        chat : ChatInfo.Chat
+            The chat message that called the command, with arg_msg and args already filled in.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.limit)
+
+        self.queued += 1
+        user = chat.user.name
+        if user in self._users:     # that viewer's task is still running and will get to this one next
+            self._users[user].append((cog, command, chat))
+            return
+
+        queue = self._users[user] = deque([(cog, command, chat)])
+        task = asyncio.create_task(self._run_user(user, queue))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+
+    async def _run_user(self, user: str, queue: deque):
+        """
+        runs one viewer's commands one after another until there aren't any left
+        """
+        try:
+            while queue:
+                cog, command, chat = queue.popleft()
+                async with self._slots:
+                    self.queued -= 1
+                    self.in_flight += 1
+                    try:
+                        await command.func(command.instance, chat, *chat.args)
+                        await cog.events.on_cmd(chat)
+                        self.completed += 1
+                    except Exception as err:
+                        self.failed += 1
+                        if not self._get_error().done():
+                            self._error.set_exception(err)
+                        return
+                    finally:
+                        self.in_flight -= 1
+        finally:
+            self.queued -= len(queue)   # anything left over if a command failed
+            del self._users[user]
+
+
+
+    def _get_error(self) -> asyncio.Future:
+        """
+        the future that gets the first exception raised by a command
+        """
+        if self._error is None:
+            self._error = asyncio.get_event_loop().create_future()
+        return self._error
+
+
+
+    async def _watch(self):
+        """
+        waits for a command to raise an exception and then raises it here instead
+        TwitchBot.Client runs this alongside IRC.listen() so exceptions from commands still stop the bot
+        """
+        await self._get_error()
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_stats(self) -> dict:
+        return {'in_flight': self.in_flight, 'queued': self.queued, 'completed': self.completed, 'failed': self.failed}
+
+
+
+
+
+
+class Router:
+    """Decides which cog (if any) a chat message is meant for.
+
+    Made by TwitchBot.Client and rebuilt every time TwitchBot.Client.add_cogs() is called. Instead of
+    every cog checking its own prefix, the router keeps a table of every cog's prefix by its first
+    character, so one lookup finds the only prefixes a message could start with.
+
+
+    Parameters
+    ------------
+    logger : Logger.Logger
+        The bot's logger.
+
+    events : Events.Handler
+        The event handler that on_bad_cmd and on_no_cmd are called on.
+
+    executor : Commands.Executor
+        Runs the commands that the router picks.
+
+
+    Attributes
+    ------------
+    See parameters
+
+    cogs : [Commands.Cog]
+        Every cog the router knows about, in the order they were added.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+
+    Note
+    ------------
+    Cogs can share a prefix. If they do, each cog with that prefix is checked for the command in the
+    order they were added. If one prefix starts with another (like '!' and '!!'), the longer one is
+    checked first.
+    """
+    def __init__(self, logger, events, executor):
+        # variables given
+        self.logger = logger
+        self.events = events
+        self.executor = executor
+
+        # variables created
+        self.cogs = []
+        self._table = dict()    # {first character of prefix: [(prefix, [Cog])]} longest prefixes first
+        self._default = []      # cogs with an empty prefix, which get checked for every message
+
+
+
+    def add_cogs(self, cogs: [Cog]):
+        """Adds cogs to the router and rebuilds the prefix table.
+
+        Parameters
+        ------------
+        cogs : [Commands.Cog]
+            The cogs to add. Cogs the router already has are skipped.
+        """
+        for cog in cogs:
+            if cog not in self.cogs:
+                self.cogs.append(cog)
+        self._build()
+
+
+
+    def _build(self):
+        """
+        makes the prefix table from every cog
+        has to be called again whenever a cog is added or a cog's prefix changes
+        """
+        by_prefix = dict()
+        for cog in self.cogs:
+            by_prefix.setdefault(cog.prefix, []).append(cog)
+
+        self._default = [('', by_prefix[''])] if '' in by_prefix else []
+        table = dict()
+        for prefix in sorted(by_prefix, key=len, reverse=True):
+            if prefix:
+                table.setdefault(prefix[0], []).append((prefix, by_prefix[prefix]))
+        for entries in table.values():
+            entries.extend(self._default)   # an empty prefix is the shortest, so it's always checked last
+        self._table = table
+
+
+
+    async def dispatch(self, chat):
+        """Finds the command a chat message is calling, if any, and gives it to the executor to run.
+
+        Calls on_cmd on the command's cog's event handler once the command finishes, or on_cooldown if it's
+        been used too recently. Calls on_bad_cmd if the message starts with a prefix but no command matches,
+        or on_no_cmd if it doesn't start with any prefix.
+
+
+        Parameters
+        ------------
+        chat : ChatInfo.Chat
+            The chat message.
+        """
+        msg = chat.msg
+        has_prefix = denied = False
+        for prefix, cogs in self._table.get(msg[:1], self._default):
+            if not msg.startswith(prefix):
+                continue
+            has_prefix = True
+            name, _, arg_msg = msg[len(prefix):].partition(' ')
+            args = arg_msg.split(' ') if arg_msg else []
+            for cog in cogs:
+                if (command := cog._find_command(name, len(args))):
+                    # commands everyone can use are let through without decoding the user's tags
+                    if not (command.permission_mask & ROLE_EVERYONE
+                            or command.permission_mask & chat.user.roles
+                            or chat.user.name in command.whitelist):
+                        denied = True
+                        continue
+                    if command.cooldowns is not None and (retry_after := command.cooldowns.take(chat.user.name if command.cooldown_per == 'user' else chat.channel)):
+                        if self.logger.is_enabled_for(19):  # so a rejected command doesn't cost a formatted message nobody sees
+                            await self.logger.log(19, 'basic', f'{name} is on cooldown for {retry_after:.1f} more seconds')
+                        await cog.events.on_cooldown(chat, retry_after)
+                        return
+                    chat.arg_msg = arg_msg
+                    chat.args = args
+                    self.executor.submit(cog, command, chat)    # the command's signature already says it takes this many args
+                    return
+
+        if denied:
+            if self.logger.is_enabled_for(19):
+                await self.logger.log(19, 'basic', f'{chat.user.name} does not have permission to use that command')
+            await self.events.on_bad_cmd(chat)
+        elif has_prefix:
+            await self.logger.log(30, 'error', 'unable to find command')
+            await self.events.on_bad_cmd(chat)
+        else:
+            await self.events.on_no_cmd(chat)
+
 
 
 
 
 
+def _priority(command: Command) -> tuple:
+    """
+    how commands with the same name are sorted, from lowest to highest priority
+    commands that need more args come first, and commands without *args come before ones with it
+    """
+    return (command.min_args, command.max_args is not None)
+
+
+
+
 
-def create(*, name: str or [str]=[], permission: str='notset', whitelist: str or [str]=[]):
+
+def create(*, name: str or [str]=[], permission: str='notset', whitelist: str or [str]=[], cooldown: float=None, rate: (int, float)=None, cooldown_per: str='user'):
     """A decorator function used to create new commands.
 
     Requirements for creating your own command:
@@ -311,14 +703,28 @@ def create(*, name: str or [str]=[], permission: str='notset', whitelist: str or
         Which viewers can use this command by name. If specified along with permission, permission will take
         precedence over whitelist.
 
+    cooldown : float (optional)
+        How many seconds have to pass before the command can be used again. The same as rate=(1, cooldown).
+
+    rate : (int, float) (optional)
+        How many times the command can be used in so many seconds. For example, rate=(3, 30) lets the command
+        be used 3 times in a row, after which it can be used about once every 10 seconds until it's been left
+        alone for a bit. Can't be used together with cooldown.
+
+    cooldown_per : {'user', 'channel'} (optional)
+        Whether each viewer gets their own cooldown ('user') or everyone in the channel shares one ('channel').
+        Defaults to 'user'.
+
 
     Raises
     -------------
     TypeError
-        Raised if kwargs are not the data types they should be.
+        Raised if kwargs are not the data types they should be, or if the function doesn't take self and chat
+        or has keyword-only parameters without defaults.
 
     ValueError
-        Raised if the kwarg, permission, is not the correct value.
+        Raised if the kwargs, permission or cooldown_per, are not the correct values, if cooldown or rate
+        aren't positive, or if both cooldown and rate are given.
 
 
     Examples
@@ -373,6 +779,14 @@ def create(*, name: str or [str]=[], permission: str='notset', whitelist: str or
     NOTE: If two commands have the same name and argcounts (*args does not count toward argcount), then
     only one will be executed.
 
+    >>> @Command.create(name='roll')
+    >>> async def roll(self, chat, sides='6'):
+    >>>     self.IRC.send(str(random.randint(1, int(sides))))
+
+    Args with default values are optional, so this command will execute with either 0 or 1 args.
+    Which command to execute is worked out from each command's parameters when it's created, so if a
+    command raises an exception (even a TypeError), TwitchPy won't try another command instead.
+
     >>> @Command.create(permisison='moderator')
     >>> async def permissionhello(self, chat):
     >>>     self.IRC.send('hello mod or broadcaster')
@@ -392,6 +806,19 @@ def create(*, name: str or [str]=[], permission: str='notset', whitelist: str or
     This command will execute if **any** moderator or broadcaster sends the message as specified by
     permission. Additionally, if any viewer named 'someviewer', regardless of if they're are a mod
     or a broadcaster or not, will also be able to execute the command.
+
+    >>> @Command.create(cooldown=30)
+    >>> async def lurk(self, chat):
+    >>>     self.IRC.send(f'{chat.user.name} is lurking')
+
+    Each viewer can only use this command once every 30 seconds. If they try to use it again before then,
+    the command won't execute and Events.Handler.on_cooldown() is called instead.
+
+    >>> @Command.create(rate=(5, 60), cooldown_per='channel')
+    >>> async def clip(self, chat):
+    >>>     self.IRC.send('clipping that!')
+
+    The whole channel can only use this command 5 times a minute.
     """
     def decorator(func):
         nonlocal whitelist
@@ -409,8 +836,21 @@ def create(*, name: str or [str]=[], permission: str='notset', whitelist: str or
             if not isinstance(w, str):
                 raise TypeError(f"TwitchPy.Commands.create(): whitelist expects 'str' not '{type(w)}'")
         if permission not in ['notset', 'everyone', 'subscriber', 'moderator', 'broadcaster']:
-            raise ValueError(f"TwitchPy.Commands.create(): permission expects 'notset', 'everyone', 'subscriber', 'moderator', or 'broadcaster' not '{permssion}'")
-
-        cmd = Command(func, names=cmd_name, permission=permission, whitelist=whitelist)
+            raise ValueError(f"TwitchPy.Commands.create(): permission expects 'notset', 'everyone', 'subscriber', 'moderator', or 'broadcaster' not '{permission}'")
+        if cooldown is not None:
+            if not isinstance(cooldown, (int, float)):
+                raise TypeError(f"TwitchPy.Commands.create(): cooldown expects 'float' not '{type(cooldown)}'")
+            if rate is not None:
+                raise ValueError('TwitchPy.Commands.create(): cooldown and rate can\'t both be given')
+        limit = (1, cooldown) if cooldown is not None else rate     # not rate itself, so create()'s result can decorate more than one function
+        if limit is not None:
+            if not (isinstance(limit, tuple) and len(limit) == 2 and isinstance(limit[0], int) and isinstance(limit[1], (int, float))):
+                raise TypeError(f"TwitchPy.Commands.create(): rate expects '(int, float)' not '{limit}'")
+            if limit[0] < 1 or limit[1] <= 0:
+                raise ValueError(f'TwitchPy.Commands.create(): rate expects a positive number of uses and seconds not {limit}')
+        if cooldown_per not in ['user', 'channel']:
+            raise ValueError(f"TwitchPy.Commands.create(): cooldown_per expects 'user' or 'channel' not '{cooldown_per}'")
+
+        cmd = Command(func, names=cmd_name, permission=permission, whitelist=whitelist, rate=limit, cooldown_per=cooldown_per)
         return cmd
     return decorator
\ No newline at end of file
@@ -98,7 +98,8 @@ class Handler:
 
     async def on_connect(self):
         """
-        Called right after the bot connects to a twitch channel.
+        Called right after the bot connects (or reconnects) to twitch, once it's asked to join its channels.
+        on_join is called for each channel once twitch says the bot has joined it.
         """
         pass
 
@@ -148,6 +149,23 @@ class Handler:
 
 
 
+    async def on_cooldown(self, chat, retry_after: float):
+        """
+        Called instead of a command when it's been used too recently. See the cooldown and rate kwargs of Commands.create()
+
+
+        Parameters
+        -------------
+        chat : ChatInfo.Chat
+            The chat object containing basic info on the message that was sent.
+
+        retry_after : float
+            How many seconds until the command can be used again.
+        """
+        pass
+
+
+
     async def on_no_cmd(self, chat):
         """
         Called whenever a viewer sends a message in chat that has nothing to do with a command cog.
@@ -163,6 +181,99 @@ class Handler:
 
 
 
+    async def on_usernotice(self, notice):
+        """
+        Called when twitch announces something in chat, like a sub, resub, gifted sub, or raid.
+
+
+        Parameters
+        -------------
+        notice : ChatInfo.UserNotice
+            What happened and who it happened to.
+        """
+        pass
+
+
+
+    async def on_clearchat(self, clear):
+        """
+        Called when a viewer is timed out or banned, or when all of chat is cleared.
+
+
+        Parameters
+        -------------
+        clear : ChatInfo.ClearChat
+            Who was timed out or banned (if anyone) and for how long.
+        """
+        pass
+
+
+
+    async def on_clearmsg(self, clear):
+        """
+        Called when a single chat message is deleted.
+
+
+        Parameters
+        -------------
+        clear : ChatInfo.ClearMsg
+            The message that was deleted and who sent it.
+        """
+        pass
+
+
+
+    async def on_roomstate(self, state):
+        """
+        Called when the bot joins a channel and whenever the channel's chat settings change (like slow mode).
+
+
+        Parameters
+        -------------
+        state : ChatInfo.RoomState
+            The settings that were sent.
+        """
+        pass
+
+
+
+    async def on_join(self, membership):
+        """
+        Called when a viewer joins chat.
+
+
+        Parameters
+        -------------
+        membership : ChatInfo.Membership
+            Who joined and where.
+        """
+        pass
+
+
+
+    async def on_part(self, membership):
+        """
+        Called when a viewer leaves chat.
+
+
+        Parameters
+        -------------
+        membership : ChatInfo.Membership
+            Who left and where.
+        """
+        pass
+
+
+
+    async def on_reconnect(self):
+        """
+        Called when twitch says it's about to close the connection for maintenance and the bot should reconnect.
+        The bot opens a new connection right after this and closes the old one once it's moved over.
+        """
+        pass
+
+
+
     async def on_death(self):
         """
         Called when the bot dies regardless of how it happens.
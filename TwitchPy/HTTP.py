@@ -0,0 +1,394 @@
+# python standard modules
+import asyncio
+import gzip
+import ssl
+import time
+from urllib.parse import urlsplit
+
+
+
+"""
+a small async HTTP/1.1 client that keeps connections open and reuses them
+made so that API calls don't stop the event loop (and with it, reading chat) while they wait for twitch
+https://datatracker.ietf.org/doc/html/rfc7230
+"""
+
+
+
+__all__ = ['Response', 'HTTPClient']
+
+
+
+# methods that can safely be sent again if a kept-alive connection turns out to have been closed by the server
+_IDEMPOTENT = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+
+class Response:
+    """An HTTP response.
+
+
+    Attributes
+    ------------
+    status : int
+        The status code. ex: 200
+
+    reason : str
+        The reason phrase that goes with the status code. ex: 'OK'
+
+    headers : dict
+        The response headers with lowercase names. ex: {'content-type': 'application/json'}
+
+    body : bytes
+        The body of the response, already decompressed if the server gzipped it.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+    """
+    __slots__ = ('status', 'reason', 'headers', 'body')
+
+    def __init__(self, status: int, reason: str, headers: dict, body: bytes):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+
+
+    def text(self) -> str:
+        """
+        the body decoded as UTF-8
+        """
+        return self.body.decode()
+
+
+
+    def __repr__(self):
+        return f'Response(status={self.status!r}, reason={self.reason!r}, bytes={len(self.body)})'
+
+
+
+
+
+
+class _Connection:
+    """
+    one open connection to a server, plus when it was last put back in the pool
+    """
+    __slots__ = ('reader', 'writer', 'idle_since')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = 0.0
+
+
+
+    def usable(self, idle_timeout: float) -> bool:
+        """
+        if it's still worth sending a request on this connection
+        """
+        return (not self.writer.is_closing() and not self.reader.at_eof()
+                and time.monotonic() - self.idle_since < idle_timeout)
+
+
+
+    def close(self):
+        """
+        closes the connection, even if the event loop it was opened in has already been closed
+        """
+        try:
+            self.writer.close()
+        except RuntimeError:    # the loop is closed, so the transport can't close itself and the socket has to be closed directly
+            if (sock := self.writer.get_extra_info('socket')) is not None:
+                getattr(sock, '_sock', sock).close()    # asyncio wraps the socket it gives out so it can't be closed by mistake
+
+
+
+
+
+
+class HTTPClient:
+    """Sends HTTP requests without blocking the event loop and keeps connections open to reuse them.
+
+    Connections are pooled per server (scheme, host, and port). A request uses an idle connection to the same
+    server if there is one and only opens a new one (with a new TLS handshake for https) if there isn't. After
+    the response is read, the connection goes back into the pool for the next request unless the server said
+    to close it.
+
+    If a server closed an idle connection just before it was reused, GET requests are sent again on a new
+    connection instead of failing.
+
+
+    Parameters
+    ------------
+    timeout : float (optional)
+        The most seconds a request can take, from sending it to reading all of the response. Defaults to 10.
+
+    max_connections : int (optional)
+        The most connections open to the same server at the same time. More requests than this to the same
+        server at once wait for a connection to be free. Defaults to 10.
+
+    idle_timeout : float (optional)
+        How many seconds a connection can sit unused in the pool before it's closed instead of reused. Defaults to 30.
+
+
+    Attributes
+    ------------
+    See parameters
+
+    requests : int
+        How many requests have been sent.
+
+    opened : int
+        How many new connections have been opened.
+
+    reused : int
+        How many requests were sent on a connection that was already open.
+
+
+    Note
+    ------------
+    Connections belong to the event loop they were opened in. Call HTTPClient.close() before that loop is closed.
+    """
+    def __init__(self, timeout: float=10, max_connections: int=10, idle_timeout: float=30):
+        # variables given
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+
+        # variables created
+        self.requests = 0
+        self.opened = 0
+        self.reused = 0
+        self._idle = dict()     # {(scheme, host, port): [_Connection]} most recently used last
+        self._limits = dict()   # {(scheme, host, port): asyncio.Semaphore}
+        self._loop = None       # the event loop the pool's connections and semaphores belong to
+        self._ssl = None        # made the first time it's needed, since loading the certificates takes a while
+
+
+
+    async def request(self, method: str, url: str, headers: dict=None, body: bytes=None, timeout: float=None) -> Response:
+        """Sends a request and reads the whole response.
+
+
+        Parameters
+        ------------
+        method : str
+            ex: 'GET'
+
+        url : str
+            ex: 'https://api.twitch.tv/helix/users?login=someviewer'
+
+        headers : dict (optional)
+            Extra headers to send.
+
+        body : bytes (optional)
+            The body of the request.
+
+        timeout : float (optional)
+            The most seconds this request can take. Defaults to the timeout attribute.
+
+
+        Returns
+        ---------
+        TwitchPy.HTTP.Response
+            The response, whatever its status code is.
+
+
+        Raises
+        ---------
+        ValueError
+            Raised if the url isn't an http or https url.
+
+        asyncio.TimeoutError
+            Raised if the request took longer than timeout.
+
+        OSError
+            Raised if the server couldn't be reached or the connection broke.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ['http', 'https'] or not parts.hostname:
+            raise ValueError(f"TwitchPy.HTTP.HTTPClient.request(): url expects an http or https url not '{url}'")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        self._check_loop()
+        if (limit := self._limits.get(key)) is None:
+            limit = self._limits[key] = asyncio.Semaphore(self.max_connections)
+        async with limit:
+            return await asyncio.wait_for(self._exchange(key, method.upper(), target, headers or dict(), body),
+                                          self.timeout if timeout is None else timeout)
+
+
+
+    async def _exchange(self, key: tuple, method: str, target: str, headers: dict, body: bytes) -> Response:
+        """
+        sends a request on a pooled connection and reads the response, then puts the connection back if it can be reused
+        """
+        scheme, host, port = key
+        lines = [f'{method} {target} HTTP/1.1',
+                 f'Host: {host}' if port == (443 if scheme == 'https' else 80) else f'Host: {host}:{port}',
+                 'Accept-Encoding: gzip',
+                 'Connection: keep-alive']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        if body is not None:
+            lines.append(f'Content-Length: {len(body)}')
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        self.requests += 1
+
+        while True:
+            connection, reused = await self._acquire(key)
+            try:
+                connection.writer.write(head + body if body is not None else head)
+                await connection.writer.drain()
+                response, keep_alive = await self._read_response(connection.reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                if reused and method in _IDEMPOTENT:    # the server closed it while it was idle, so try a new one
+                    continue
+                raise
+            except BaseException:   # including being cancelled by a timeout, which leaves the connection in an unknown state
+                connection.close()
+                raise
+
+            if keep_alive:
+                self._release(key, connection)
+            else:
+                connection.close()
+            return response
+
+
+
+    async def _acquire(self, key: tuple) -> (_Connection, bool):
+        """
+        gets the most recently used idle connection to a server that's still good, or opens a new one
+        returns (connection, whether it was reused)
+        """
+        idle = self._idle.get(key, [])
+        while idle:
+            connection = idle.pop()
+            if connection.usable(self.idle_timeout):
+                self.reused += 1
+                return connection, True
+            connection.close()
+
+        scheme, host, port = key
+        if scheme == 'https' and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port, ssl=self._ssl if scheme == 'https' else None)
+        self.opened += 1
+        return _Connection(reader, writer), False
+
+
+
+    def _release(self, key: tuple, connection: _Connection):
+        """
+        puts a connection back in the pool
+        """
+        connection.idle_since = time.monotonic()
+        self._idle.setdefault(key, []).append(connection)
+
+
+
+    async def _read_response(self, reader, method: str) -> (Response, bool):
+        """
+        reads the status line, headers, and body of a response
+        returns (response, whether the connection can be used again)
+        """
+        line = await reader.readline()
+        if not line:
+            raise ConnectionResetError('the server closed the connection without responding')
+        version, _, rest = line.decode('latin-1').rstrip('\r\n').partition(' ')
+        status, _, reason = rest.partition(' ')
+        status = int(status)
+
+        headers = dict()
+        while (line := await reader.readline()) not in [b'\r\n', b'\n', b'']:
+            name, _, value = line.decode('latin-1').partition(':')
+            name, value = name.strip().lower(), value.strip()
+            headers[name] = f'{headers[name]}, {value}' if name in headers else value
+
+        keep_alive = version == 'HTTP/1.1' and 'close' not in headers.get('connection', '').lower()
+        if method == 'HEAD' or status in [204, 304] or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            body = await self._read_chunked(reader)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:   # the body ends when the server closes the connection
+            body = await reader.read()
+            keep_alive = False
+
+        if headers.get('content-encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        return Response(status, reason, headers, body), keep_alive
+
+
+
+    @staticmethod
+    async def _read_chunked(reader) -> bytes:
+        """
+        reads a body sent with Transfer-Encoding: chunked
+        https://datatracker.ietf.org/doc/html/rfc7230#section-4.1
+        """
+        chunks = []
+        while True:
+            line = await reader.readline()
+            if not line:    # only '0\r\n' ends the body, this means the server closed the connection partway through it
+                raise ConnectionResetError('the server closed the connection in the middle of a chunked body')
+            if not (size := int(line.split(b';', 1)[0].strip() or b'0', 16)):
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)     # the '\r\n' after every chunk
+        while (await reader.readline()) not in [b'\r\n', b'\n', b'']:  # trailers, which we don't need
+            pass
+        return b''.join(chunks)
+
+
+
+    def _check_loop(self):
+        """
+        connections and semaphores only work in the event loop they were made in (TwitchPy makes more than one),
+        so they're closed and forgotten if this is being used from a different one
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._close_idle()
+            self._limits = dict()
+            self._loop = loop
+
+
+
+    async def close(self):
+        """Closes every idle connection.
+        """
+        self._close_idle()
+
+
+
+    def _close_idle(self):
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle = dict()
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_stats(self) -> dict:
+        """
+        how many requests have been sent, how many new connections were opened, how many requests reused a connection,
+        and how many connections are open and waiting to be reused ('idle')
+        """
+        return {
+            'requests': self.requests,
+            'opened': self.opened,
+            'reused': self.reused,
+            'idle': sum(len(connections) for connections in self._idle.values()),
+        }
\ No newline at end of file
@@ -1,18 +1,12 @@
-# TO DO:
-#     * if i'm smart enough, figure out a system to allow multiple logger types
-#         for instance, i want to set one console logger, and two file loggers
-#         the console logger will show init+ stuff
-#         one file logger will show EVERYTHING
-#         the other file logger will only store chat messages
-#         >>> the problem with this is how is the user going to use filters effectively?
-#             if they've got 4 different loggers, how are they going to specify the filters for each?
-#               >>> we could create a class for loggers that hold a filter attribute
-
-
-
 # python standard modules
-import inspect
+import asyncio
 import logging
+import logging.handlers
+from operator import attrgetter
+import os
+import queue
+import re
+import sys
 from sys import stdout
 
 # TwitchPy Modules
@@ -35,6 +29,119 @@ logging.addLevelName(INIT, 'INIT')
 logging.addLevelName(BASIC, 'BASIC')
 logging.addLevelName(MSG, 'MSG')
 
+# frames from inside asyncio are skipped when looking up who called Logger.log()
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+
+def _find_caller():
+    """
+    finds the frame of whatever called Logger.log() by walking back from it one frame at a time
+    and skipping over any frames that belong to asyncio (like when log() is passed into asyncio.run())
+    this only walks as many frames as it needs to, unlike inspect.stack() which builds every frame
+    and reads the source lines for all of them
+
+    returns     (filename, lineno, function name) of the calling frame
+    """
+    frame = sys._getframe(2)    # 0 is this function and 1 is Logger.log()
+    while frame and frame.f_code.co_filename.startswith(_ASYNCIO_DIR):
+        frame = frame.f_back
+    if not frame:
+        return '(unknown file)', 0, '(unknown function)'
+    return frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name
+
+
+
+def _lowest_level(logger) -> float:
+    """
+    finds the lowest level that logging.Logger.handle() would actually emit anywhere
+    follows the same path as logging.Logger.callHandlers() so propagation to parent loggers is respected
+    returns infinity if the logger will never emit anything
+    """
+    if not logger or logger.disabled:
+        return float('inf')
+    levels = []
+    current = logger
+    while current:
+        levels += [handler.level for handler in current.handlers]
+        current = current.parent if current.propagate else None
+    if not levels and logging.lastResort:   # logging falls back to lastResort if there aren't any handlers
+        levels.append(logging.lastResort.level)
+    return min(levels, default=float('inf'))
+
+
+
+def _compile_chatfmt(chatfmt: str):
+    """
+    turns a chatfmt like '%(user.name)s: %(msg)s' into a positional format '%s: %s' and a getter that
+    pulls ('user.name', 'msg') straight off of a ChatInfo.Chat in one go
+    this way formatting a chat doesn't have to build a dict out of the chat's (and the user's) attributes
+
+    returns     (positional format, getter)
+    """
+    keys = []
+    def replace(match):
+        if match.group(1) is None:  # '%%' stays as it is
+            return match.group(0)
+        keys.append(match.group(1))
+        return '%'
+    fmt = re.sub(r'%(?:%|\(([^)]*)\))', replace, chatfmt)
+
+    if not keys:
+        return fmt, lambda chat: ()
+    if len(keys) == 1:  # attrgetter only returns a tuple if it has more than one attribute to get
+        getter = attrgetter(keys[0])
+        return fmt, lambda chat: (getter(chat),)
+    return fmt, attrgetter(*keys)
+
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    a logging.handlers.QueueHandler that doesn't blow up when its queue is full
+    policy 'drop' throws the record away (and counts it) while 'block' waits for the writer thread to make space
+    """
+    def __init__(self, queue_, policy: str):
+        super().__init__(queue_)
+        self.policy = policy
+        self.dropped = 0
+
+
+
+    def enqueue(self, record):
+        if self.policy == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """
+    a logging.handlers.QueueListener whose stop() still works when the queue is full
+    """
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+
+class _WorkerHandler(logging.handlers.QueueHandler):
+    """
+    a logging.handlers.QueueHandler for worker processes that puts ('log', logger name, record) on the worker's pipe
+    so the supervisor process can hand the record to its own logger with the same name (see Workers.Supervisor)
+    """
+    def __init__(self, queue_, name: str):
+        super().__init__(queue_)
+        self.logger_name = name
+
+
+
+    def enqueue(self, record):
+        self.queue.put(('log', self.logger_name, record))
+
 
 
 class Logger:
@@ -48,7 +155,8 @@ class Logger:
     Features:
 
         * chat formatting to change how you want your twich chat messages to look in the log
-        * custom filters for both console and file loggers to filter out what messages you do and do not want to see for both individually
+        * as many named loggers as you want (like 'console' and 'file'), each with their own level
+        * custom filters for every logger to filter out what messages you do and do not want to see for each individually
         * presets ('default', 'recommended')
         * lets you create basic loggers so you don't have to import logging
         * supports creating your own logger via logging and using it in this
@@ -79,14 +187,18 @@ class Logger:
 
     Attributes
     -----------
+    loggers : dict
+        All of the loggers by name. Each one is an instance of logging.Logger .
+
     console : logging.Logger
-        An instance of logging.Logger used specifically to log to the console.
+        The logger named 'console'. None if there isn't one.
 
     file : logging.Logger
-        An instance of logging.Logger used specifically to log to files.
+        The logger named 'file'. None if there isn't one.
 
     filter : dict
-        A filter so you can decide what the console and file loggers can and can't log.
+        A filter so you can decide what each logger can and can't log.
+        Structured as {module: {type: {logger names}}}.
         Note: This is not the filter from the logging library.
 
 
@@ -101,21 +213,20 @@ class Logger:
 
     Note
     ---------
-    We hold two instances of loggers (console and file) so you can more precisely control the behaviors of each,
-    allowing the console logger to act differently than the file logger.
+    Every logger has a name so you can more precisely control the behaviors of each, allowing the console
+    logger to act differently than the file logger. Logger.Logger.create_console_logger() and
+    Logger.Logger.create_file_logger() use the names 'console' and 'file' unless you give them a different one,
+    so you can have as many of each as you want. For instance, one console logger that shows init messages and
+    above, one file logger that stores everything, and another file logger that only stores chat messages.
 
     Note
     --------
-    While we don't inherently support more than two loggers (one for the console and one for file),
-    the console logger and file logger names are purely cosmetic. We make no checks to ensure that
-    those loggers have purely consolehandlers or filehandlers. Additionally, we support you defining
-    your own logger (via the logging module) and using the Logger.set[loggertype]() function. So you could make
-    a logger, add a filehandler, and pass it to Logger.set_console_logger() and that would work without problem.
-    This means that if you wanted to do things like printing to multiple files at the same time, or other
-    things that might require more than two loggers, you might be able to find some crafty solutions at:
-    https://docs.python.org/3/howto/logging-cookbook.html
-
-    Alternatively, if that's too confusing or doesn't quite allow you to do what you want to do,
+    The names are purely cosmetic. We make no checks to ensure that those loggers have purely consolehandlers or filehandlers.
+    Additionally, we support you defining your own logger (via the logging module) and using Logger.Logger.set_logger()
+    to give it to the bot. So you could make a logger, add a filehandler, and pass it to Logger.set_console_logger() and
+    that would work without problem.
+
+    Alternatively, if that doesn't quite allow you to do what you want to do,
     you can always catch the on_log event which will be called whenever the bot tries to log something.
     The on_log event will receive the same information that the logger would.
     """
@@ -130,12 +241,18 @@ class Logger:
 
         # variables given
         self.chatfmt = chatfmt
+        self._chatfmt, self._chat_getter = _compile_chatfmt(chatfmt)
 
         # variables created
-        self.console = None
-        self.file = None
+        self.loggers = dict()
         self.filter = dict()
         self.events = None
+        self._routes = dict()               # (module, type) -> ((lowest level, logger),) for every filtered (module, type)
+        self._default_route = tuple()       # ((lowest level, logger),) for any (module, type) that isn't filtered
+        self._min_level = float('inf')      # the lowest level that anything (loggers or on_log) will see
+        self._log_subscribed = False        # if the event handler overrides on_log
+        self._queued = []                   # (logger, queue handler, listener) for every queued logger
+        self._dropped = 0                   # records dropped by queued loggers that have already been removed
 
         # additional setup
         self._choose_preset(preset)
@@ -156,17 +273,81 @@ class Logger:
 
 
 
+    @property
+    def console(self):
+        return self.loggers.get('console')
+
+
+
+    @property
+    def file(self):
+        return self.loggers.get('file')
+
+
+
+    def refresh_levels(self):
+        """Recompiles which loggers every log message should go to.
+
+        Logger.Logger.log() uses this to find the loggers for a message with a single lookup and to throw away
+        messages that nothing is going to see before doing any work on them. TwitchPy already does this for you
+        whenever a logger, filter, or the event handler is set, so you only need to call this if you change the
+        levels of your loggers' handlers yourself afterwards.
+        """
+        levels = {name: _lowest_level(logger) for name, logger in self.loggers.items()}
+
+        self._default_route = tuple((levels[name], logger) for name, logger in self.loggers.items())
+        self._routes = dict()
+        for module, types in self.filter.items():
+            for type_, filtered in types.items():
+                self._routes[(module, type_)] = tuple((levels[name], logger) for name, logger in self.loggers.items()
+                                                        if name not in filtered)
+
+        self._log_subscribed = bool(self.events) and type(self.events).on_log is not Handler.on_log
+        if self._log_subscribed:    # on_log wants to see everything
+            self._min_level = float('-inf')
+        else:
+            self._min_level = min(levels.values(), default=float('inf'))
+
+
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Checks if a message of this level would be seen by any of the loggers or the on_log event.
+
+
+        Parameters
+        ------------
+        level : int
+            The level of the log message. See Logger.Logger.log()
+
+
+        Returns
+        ---------
+        bool
+            True if logging a message of this level would do anything.
+        """
+        return level >= self._min_level
+
+
+
     def create_console_logger(  self, *,
+                                name='console',
                                 fmt='[%(levelname)-8s] [%(module)-10s] [%(asctime)s] %(message)s',
                                 datefmt='%H:%M:%S',
-                                level=11):
+                                level=11,
+                                queued=False,
+                                queue_size=10000,
+                                queue_policy='drop'):
         """A convenient function to create a logger without you having to import the loggin module.
 
-        Note: This will set Logger.Logger.console
+        Note: If there is already a logger with this name, it will be replaced.
 
 
         Keyword Arguments
         -------------------
+        name : str (optional)
+            The name of the logger. This is what you use to set filters for it.
+            If not given, will default to 'console' which is also Logger.Logger.console
+
         fmt : str (optional)
             See https://docs.python.org/2/library/logging.html#logrecord-attributes
 
@@ -183,41 +364,71 @@ class Logger:
             see Logging for TwitchPy's custom levels.
             If not given, will default to 11 or Logging.INIT
 
+        queued : bool (optional)
+            If True, log messages are put in a queue and written out by a background thread instead of being
+            written while the bot waits. Useful if writing is slow (like a busy disk) because it keeps the bot
+            from falling behind on chat. Queued messages are written out when the bot shuts down (see Logger.Logger.shutdown()).
+            If not given, will default to False
+
+        queue_size : int (optional)
+            The maximum number of messages the queue can hold if queued is True.
+            If not given, will default to 10000
+
+        queue_policy : {'drop', 'block'} (optional)
+            What to do with a new message when the queue is full. 'drop' throws the message away while
+            'block' makes the bot wait until there is space for it. See Logger.Logger.get_dropped_count()
+            If not given, will default to 'drop'
+
 
         Raises
         --------
         TypeError
             Raised if kwargs are not the correct data type.
+
+        ValueError
+            Raised if the kwarg, queue_policy, is not the correct value.
         """
         # input sanitization
+        if (err_msg := check_param(name, str)):
+            raise TypeError(f'TwitchPy.Logger.Logger.create_console_logger(): {err_msg}')
         if (err_msg := check_param(fmt, str)):
             raise TypeError(f'TwitchPy.Logger.Logger.create_console_logger(): {err_msg}')
         if (err_msg := check_param(datefmt, str)):
             raise TypeError(f'TwitchPy.Logger.Logger.create_console_logger(): {err_msg}')
         if (err_msg := check_param(level, int)):
             raise TypeError(f'TwitchPy.Logger.Logger.create_console_logger(): {err_msg}')
+        if (err_msg := check_param(queued, bool)):
+            raise TypeError(f'TwitchPy.Logger.Logger.create_console_logger(): {err_msg}')
+        if (err_msg := check_param(queue_size, int)):
+            raise TypeError(f'TwitchPy.Logger.Logger.create_console_logger(): {err_msg}')
+        if queue_policy not in ['drop', 'block']:
+            raise ValueError(f"TwitchPy.Logger.Logger.create_console_logger(): queue_policy expects 'drop' or 'block' not '{queue_policy}'")
 
-        self.console = logging.getLogger('console')
         console_handler = logging.StreamHandler(stdout)
         console_handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
         console_handler.setLevel(level)
-        self.console.addHandler(console_handler)
+        self._create_logger(name, console_handler, queued, queue_size, queue_policy)
 
 
 
     def create_file_logger(     self, *,
+                                name='file',
                                 filename='TwitchBot.log',
                                 filemode='a',
                                 fmt='[%(levelname)-8s] [%(module)-10s] [%(asctime)s] %(message)s',
                                 datefmt='%Y/%m/%d - %H:%M:%S',
-                                level=19):
+                                level=19,
+                                queued=False,
+                                queue_size=10000,
+                                queue_policy='drop'):
         """See Logger.Logger.create_console_logger() for any missing information
 
-        Note: This will set Logger.Logger.file
-
 
         Keyword Arguments
         ------------------
+        name : str (optional)
+            The name of the logger. If not given, will default to 'file' which is also Logger.Logger.file
+
         filename : str (optional)
             The path / filename of the file to log to. If not given, will default to 'TwitchBot.log'
 
@@ -229,31 +440,129 @@ class Logger:
         --------
         TypeError
             Raised if kwargs are not the correct data type.
+
+        ValueError
+            Raised if the kwarg, queue_policy, is not the correct value.
         """
         # input sanitization
+        if (err_msg := check_param(name, str)):
+            raise TypeError(f'TwitchPy.Logger.Logger.create_file_logger(): {err_msg}')
         if (err_msg := check_param(fmt, str)):
             raise TypeError(f'TwitchPy.Logger.Logger.create_file_logger(): {err_msg}')
         if (err_msg := check_param(datefmt, str)):
             raise TypeError(f'TwitchPy.Logger.Logger.create_file_logger(): {err_msg}')
         if (err_msg := check_param(level, int)):
             raise TypeError(f'TwitchPy.Logger.Logger.create_file_logger(): {err_msg}')
+        if (err_msg := check_param(queued, bool)):
+            raise TypeError(f'TwitchPy.Logger.Logger.create_file_logger(): {err_msg}')
+        if (err_msg := check_param(queue_size, int)):
+            raise TypeError(f'TwitchPy.Logger.Logger.create_file_logger(): {err_msg}')
+        if queue_policy not in ['drop', 'block']:
+            raise ValueError(f"TwitchPy.Logger.Logger.create_file_logger(): queue_policy expects 'drop' or 'block' not '{queue_policy}'")
 
-        self.file = logging.getLogger('file')
         file_handler = logging.FileHandler(filename, filemode)
         file_handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
         file_handler.setLevel(level)
-        self.file.addHandler(file_handler)
+        self._create_logger(name, file_handler, queued, queue_size, queue_policy)
 
 
 
-    def console_filter(self, filter_: [str]):
-        """Lets you set custom filters to decide what you do and do not want your logger to see.
+    def _create_logger(self, name: str, handler, queued: bool, queue_size: int, queue_policy: str):
+        """
+        makes a new logging.Logger that belongs only to this instance and adds the handler to it
+        either directly or, if queued, behind a bounded queue that a background thread reads from
+        and passes on to the handler.
+        the logger isn't registered with logging.getLogger() so that multiple instances of Logger.Logger
+        don't end up sharing (and piling handlers onto) the same logger
+        """
+        logger = logging.Logger(f'TwitchPy.{name}')
+
+        if queued:
+            queue_handler = _BoundedQueueHandler(queue.Queue(queue_size), queue_policy)
+            queue_handler.setLevel(handler.level)   # so records the handler doesn't want never make it into the queue
+            listener = _QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+            listener.start()
+            logger.addHandler(queue_handler)
+            self._queued.append((logger, queue_handler, listener))
+        else:
+            logger.addHandler(handler)
+
+        self.remove_logger(name)
+        self.loggers[name] = logger
+        self.refresh_levels()
+
+
+
+    def remove_logger(self, name: str):
+        """Removes a logger by name. Does nothing if there is no logger with that name.
+
+        If the logger was queued, everything still in its queue is written out first.
+
+
+        Parameters
+        ------------
+        name : str
+            The name of the logger to remove.
+        """
+        logger = self.loggers.pop(name, None)
+        if not logger:
+            return
+        for entry in [entry for entry in self._queued if entry[0] is logger]:
+            self._stop_queue(*entry)
+            self._queued.remove(entry)
+        self.refresh_levels()
+
+
+
+    def _stop_queue(self, logger, queue_handler, listener):
+        """
+        stops a queued logger's background thread after it writes out everything in the queue,
+        and then gives the logger its real handler back so anything logged afterwards is written straight away
+        """
+        listener.stop()     # waits for the background thread to write out everything in the queue
+        self._dropped += queue_handler.dropped
+        logger.removeHandler(queue_handler)
+        for handler in listener.handlers:
+            logger.addHandler(handler)
+
+
+
+    def shutdown(self):
+        """Writes out everything still waiting in the queues of queued loggers and stops their background threads.
+
+        TwitchBot.Client.run() calls this for you when the bot shuts down. Anything logged after this is
+        written straight away instead of being queued.
+        """
+        for entry in self._queued:
+            self._stop_queue(*entry)
+        self._queued = []
+        self.refresh_levels()
+
+
+
+    def _send_to(self, queue_):
+        """
+        makes every logger put its records on queue_ instead of handling them itself, for worker processes (see Workers.Supervisor)
+        filters and levels still apply here so that only records that would actually be logged are sent
+        the background threads of queued loggers don't exist in a forked process, so they're forgotten instead of stopped
+        """
+        self._queued = []
+        for name, logger in self.loggers.items():
+            level = _lowest_level(logger)
+            handler = _WorkerHandler(queue_, name)
+            handler.setLevel(level if level != float('inf') else logging.CRITICAL + 1)     # +1 so a logger that logged nothing still doesn't
+            logger.handlers = [handler]
+            logger.propagate = False
+        self.refresh_levels()
+
+
+
+    def set_filter(self, name: str, filter_: [str]):
+        """Lets you set custom filters to decide what you do and do not want a logger to see.
 
         For most purposes, just setting the logger's level is good enough, but this is here to give you even
         finer control than that.
 
-        Note: This will only effect Logger.Logger.console
-
 
         Note
         -----------
@@ -262,6 +571,9 @@ class Logger:
 
         Parameters
         ------------
+        name : str
+            The name of the logger that this filter is for. Like 'console' or 'file'.
+
         filter_ : [str]
             A list of all the things you do **NOT** want the logger to see.
             Each entry should be structured as so: Module-Type
@@ -299,64 +611,49 @@ class Logger:
         """
 
         """
-        full filter structure
-        'TwitchBot': {
-            'init': (),
-            'basic': ()
-        },
+        example filter structure
         'API': {
-            'init': (),
-            'basic': (),
-            'request_get': (self.console, self.file),
-            'request_response': (self.console, self.file),
-            'error': (self.file)
+            'request_get': {'console', 'file'},
+            'request_response': {'console', 'file'},
+            'error': {'file'}
         },
         'Websocket': {
-            'init': (),
-            'basic': (),
-            'incoming': (),
-            'outgoing': (),
-            'send': (self.console, self.file),
-            'recv': (self.console, self.file),
-            'error': (self.file)
-        },
-        'Events': {
-            'init': ()
-        },
-        'Commands': {
-            'error': ()
+            'send': {'console', 'file'},
+            'recv': {'console', 'file'},
+            'error': {'file'}
         }
         """
-        for fil in filter_:
+        # input sanitization
+        if (err_msg := check_param(name, str)):
+            raise TypeError(f'TwitchPy.Logger.Logger.set_filter(): {err_msg}')
+
+        for fil in makeiter(filter_):
             # input sanitization
             if (err_msg := check_param(fil, str)):
-                raise TypeError(f'TwitchPy.Logger.Logger.console_filter(): {err_msg}')
+                raise TypeError(f'TwitchPy.Logger.Logger.set_filter(): {err_msg}')
 
             module = fil[:fil.find('-')]
             type_ = fil[fil.find('-')+1:]
-            if module not in self.filter or type_ not in self.filter[module]:
-                self.filter[module] = {type_:(self.console)}
-            else:
-                self.filter[module][type_].add(self.console)
+            self.filter.setdefault(module, dict()).setdefault(type_, set()).add(name)
+        self.refresh_levels()
 
 
 
-    def file_filter(self, filter_: [str]):
-        """See Logger.Logger.console_filter() for a detailed explanation
+    def console_filter(self, filter_: [str]):
+        """Sets filters for Logger.Logger.console
 
-        Note: this will only effect Logger.Logger.file
+        See Logger.Logger.set_filter() for a detailed explanation
         """
-        for fil in filter_:
-            # input sanitization
-            if (err_msg := check_param(fil, str)):
-                raise TypeError(f'TwitchPy.Logger.Logger.file_filter(): {err_msg}')
+        self.set_filter('console', filter_)
 
-            module = fil[:fil.find('-')]
-            type_ = fil[fil.find('-')+1:]
-            if module not in self.filter or type_ not in self.filter[module]:
-                self.filter[module] = {type_:(self.file)}
-            else:
-                self.filter[module][type_].add(self.file)
+
+
+    def file_filter(self, filter_: [str]):
+        """Sets filters for Logger.Logger.file
+
+        See Logger.Logger.set_filter() for a detailed explanation
+        """
+        self.set_filter('file', filter_)
 
 
 
@@ -364,7 +661,7 @@ class Logger:
         """Checks filters and logs your messages accordingly.
 
         Makes a logging record object (https://docs.python.org/3/library/logging.html#logrecord-objects)
-        by filling in the fields with information gathered from inspect frames (https://docs.python.org/3/library/inspect.html#the-interpreter-stack),
+        by filling in the fields with information gathered from the calling frame (https://docs.python.org/3/library/inspect.html#the-interpreter-stack),
         then logs with the appropriate loggers according to the filters, and finally passes on the record to the on_log event.
 
 
@@ -390,6 +687,10 @@ class Logger:
         TypeError
             Raised if parameters are not the correct data type.
         """
+        # bail out before doing any work if nothing is going to see this message
+        if isinstance(level, int) and level < self._min_level:
+            return
+
         # input sanitization
         if (err_msg := check_param(level, int)):
             raise TypeError(f'TwitchPy.Logger.Logger.log(): {err_msg}')
@@ -398,41 +699,39 @@ class Logger:
         if not isinstance(msg, str) and not isinstance(msg, Chat):
             raise TypeError(f"TwitchPy.Logger.Logger.log(): msg expects 'str' or 'TwitchPy.ChatInfo.Chat' not {type(msg)}")
 
-        # the following is a really cooky way to get information about the calling function
-        # i don't rightly understand it too well, but it works
-        stack = inspect.stack()
-        frame = [frame for frame in stack if '\\lib\\asyncio' not in frame.filename]
-        frame = frame[1]
+        pathname, lineno, func = _find_caller()
+        module = os.path.splitext(os.path.basename(pathname))[0]    # the same way logging.LogRecord gets its module
+
+        # find out which loggers this message goes to with a single lookup and then check their levels
+        loggers = [logger for logger_level, logger in self._routes.get((module, type_), self._default_route) if level >= logger_level]
 
+        if not loggers and not self._log_subscribed:
+            return
 
         if isinstance(msg, Chat): # check if this is a string or a twitch chat message
-            """
-            we get dicts for the chat object which is exactly what we need to use for string formatting
-            see https://realpython.com/python-string-formatting/#1-old-style-string-formatting-operator
-            this would be good enough, but the variable chat.user is an object itself and so we need
-            to add chat.user's dict to chat.__dict__
-            we also need to adjust the key names in chat.user.__dict__ so that they all begin with 'user.'
-            just for clarity for the user
-            """
-            user_vars = msg.user.__dict__
-            fixed_user_vars = dict()
-            for var in user_vars:   # dict keys are immutable, so in order to put 'user.' in front of the keys, we need to make a new dict
-                fixed_user_vars[f'user.{var}'] = user_vars[var]
-            all_vars = msg.__dict__
-            all_vars.update(fixed_user_vars) # combine chat.__dict__ with the fixed chat.user.__dict__
-            msg = self.chatfmt % all_vars
+            # chatfmt was already compiled into a getter for all the attributes it uses (see _compile_chatfmt())
+            # see https://realpython.com/python-string-formatting/#1-old-style-string-formatting-operator
+            msg = self._chatfmt % self._chat_getter(msg)
+
+        record = logging.LogRecord(name='root', level=level, pathname=pathname, lineno=lineno,
+                                    msg=msg, args=None, exc_info=exc, func=func)
 
-        record = logging.LogRecord(name='root', level=level, pathname=frame.filename, lineno=frame.lineno,
-                                    msg=msg, args=None, exc_info=exc, func=frame.function)
+        for logger in loggers:
+            logger.handle(record)
 
-        for logger in [self.console, self.file]: # check the filters
-            if logger:
-                if record.module not in self.filter or type_ not in self.filter[record.module]: # if the module or the type aren't in the filter, then they aren't filtered out
-                    logger.handle(record)
-                elif logger not in self.filter[record.module][type_]: # if the logger isn't in the appropriate location, then that means it isn't filtered out
-                    logger.handle(record)
+        if self._log_subscribed:
+            await self.events.on_log(type_, record)
 
-        await self.events.on_log(type_, record)
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_dropped_count(self) -> int:
+        """Gets how many log messages queued loggers have thrown away because their queue was full.
+        """
+        return self._dropped + sum(queue_handler.dropped for _, queue_handler, _ in self._queued)
 
 
 
@@ -462,6 +761,7 @@ class Logger:
             raise TypeError(f"TwitchPy.Logger.Logger.set_eventhandler(): {err_msg}")
 
         self.events = events
+        self.refresh_levels()
 
 
 
@@ -485,18 +785,23 @@ class Logger:
             raise TypeError(f'TwitchPy.Logger.Logger.set_chatfmt(): {err_msg}')
 
         self.chatfmt = chatfmt
+        self._chatfmt, self._chat_getter = _compile_chatfmt(chatfmt)
 
 
 
-    def set_console_logger(self, logger):
-        """An alternative way to set the console logger.
+    def set_logger(self, name: str, logger):
+        """An alternative way to create a logger.
 
-        Instead of creating one using Logger.Logger.create_console_logger(), you can define your own
-        logging logger outside of this class, and use this function to give it to the bot.
+        Instead of creating one using Logger.Logger.create_console_logger() or Logger.Logger.create_file_logger(),
+        you can define your own logging logger outside of this class, and use this function to give it to the bot.
+        If there is already a logger with this name, it will be replaced.
 
 
         Parameters
         ------------
+        name : str
+            The name of the logger. This is what you use to set filters for it.
+
         logger : logging.Logger
             MUST be a logger created by the logging module.
 
@@ -507,24 +812,29 @@ class Logger:
             Raised if parameters are no the correct data type.
         """
         # input sanitization
-        if (err_msg := check_param(logger, Logger)):
-            raise TypeError(f'TwitchPy.Logger.Logger.set_console_logger(): {err_msg}')
-
-        self.console = logger
+        if (err_msg := check_param(name, str)):
+            raise TypeError(f'TwitchPy.Logger.Logger.set_logger(): {err_msg}')
+        if (err_msg := check_param(logger, logging.Logger)):
+            raise TypeError(f'TwitchPy.Logger.Logger.set_logger(): {err_msg}')
 
+        self.remove_logger(name)
+        self.loggers[name] = logger
+        self.refresh_levels()
 
 
-    def set_file_logger(self, logger):
-        """See Logger.Logger.set_console_logger()
 
+    def set_console_logger(self, logger):
+        """Sets Logger.Logger.console
 
-        Raises
-        ---------
-        TypeError
-            Raised if parameters are no the correct data type.
+        See Logger.Logger.set_logger()
         """
-        # input sanitization
-        if (err_msg := check_param(logger, Logger)):
-            raise TypeError(f'TwitchPy.Logger.Logger.set_eventhandler(): {err_msg}')
+        self.set_logger('console', logger)
+
 
-        self.file = logger
\ No newline at end of file
+
+    def set_file_logger(self, logger):
+        """Sets Logger.Logger.file
+
+        See Logger.Logger.set_logger()
+        """
+        self.set_logger('file', logger)
\ No newline at end of file
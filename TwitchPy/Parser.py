@@ -0,0 +1,290 @@
+# python standard modules
+import re
+import sys
+
+
+
+"""
+parses raw lines from twitch IRC into their parts:
+    @<tags> :<prefix> <command> <params> :<trailing>
+all the parts besides the command are optional
+https://ircv3.net/specs/extensions/message-tags.html
+https://dev.twitch.tv/docs/irc/guide
+"""
+
+
+
+__all__ = ['Message', 'parse', 'parse_command', 'parse_tags', 'unescape_tag']
+
+
+
+# what each escaped character in a tag value turns back into
+# https://ircv3.net/specs/extensions/message-tags.html#escaping-values
+_TAG_ESCAPES = {':': ';', 's': ' ', '\\': '\\', 'r': '\r', 'n': '\n'}
+_TAG_ESCAPE_RE = re.compile(r'\\(.?)', re.DOTALL)
+
+
+
+def unescape_tag(value: str) -> str:
+    """Turns an escaped IRCv3 tag value back into what it's supposed to be.
+
+    For example, 'hello\\sworld' becomes 'hello world' and 'a\\:b' becomes 'a;b'.
+
+
+    Parameters
+    ------------
+    value : str
+        The tag value as twitch sent it.
+
+
+    Returns
+    ---------
+    str
+        The unescaped tag value.
+    """
+    if '\\' not in value:
+        return value
+    # any other escaped character is just the character itself and a lone \ at the end is dropped
+    return _TAG_ESCAPE_RE.sub(lambda match: _TAG_ESCAPES.get(match.group(1), match.group(1)), value)
+
+
+
+def parse_tags(raw_tags: str) -> dict:
+    """Parses the tags portion of a line (without the leading '@') into a dict.
+
+
+    Parameters
+    ------------
+    raw_tags : str
+        ex: 'badge-info=;badges=broadcaster/1;color=#FF0000;display-name=SomeViewer'
+
+
+    Returns
+    ---------
+    dict
+        ex: {'badge-info': '', 'badges': 'broadcaster/1', 'color': '#FF0000', 'display-name': 'SomeViewer'}
+    """
+    escaped = '\\' in raw_tags    # most lines don't have any escaped values, so only check each value if we have to
+    tags = dict()
+    for tag in raw_tags.split(';'):
+        key, _, value = tag.partition('=')
+        tags[sys.intern(key)] = unescape_tag(value) if escaped else value   # interned so every message shares the same key strings
+    return tags
+
+
+
+class Message:
+    """Holds all the parts of a single line received from twitch IRC.
+
+    One of these is made for every line the bot receives. See Parser.parse()
+
+
+    Attributes
+    ------------
+    raw : str
+        The line exactly as it was received.
+
+    tags : dict
+        The line's IRCv3 tags with their values unescaped. Empty if the line doesn't have any.
+        Tags aren't decoded until the first time this is accessed, after which they're saved.
+
+        See https://dev.twitch.tv/docs/irc/tags
+
+    prefix : str
+        Who sent the line. ex: 'someviewer!someviewer@someviewer.tmi.twitch.tv' or 'tmi.twitch.tv'.
+        None if the line doesn't have one.
+
+    nick : str
+        The part of the prefix before the '!'. For chat messages, this is the login name of the viewer.
+        None if the line doesn't have a prefix.
+
+    command : str
+        ex: 'PRIVMSG', 'PING', 'USERNOTICE', or '001'
+
+    params : (str)
+        All the parameters that come after the command, not including the trailing parameter.
+        ex: ('#somechannel',)
+
+    trailing : str
+        The last parameter (the one after ' :'), which can contain spaces. For chat messages, this is the message itself.
+        None if the line doesn't have one.
+
+
+    Note
+    ------------
+    You shouldn't have to make an instance of this class.
+
+    Note
+    ------------
+    Chat history holds on to one of these for every message, so it only stores what it can't cheaply
+    work out again from raw. prefix and nick are found in raw when they're accessed, and command and
+    params are interned so that every message shares the same 'PRIVMSG' and '#channel' strings.
+    """
+    __slots__ = ('raw', 'command', 'params', 'trailing', '_tag_end', '_tags')
+
+    def __init__(self, raw: str, tag_end: int, command: str, params: (str), trailing: str):
+        self.raw = raw
+        self.command = command
+        self.params = params
+        self.trailing = trailing
+        self._tag_end = tag_end     # the tags are raw[1:tag_end], or 0 if there aren't any
+        self._tags = None
+
+
+
+    @property
+    def tags(self) -> dict:
+        if self._tags is None:
+            self._tags = parse_tags(self.raw[1:self._tag_end]) if self._tag_end else dict()
+        return self._tags
+
+
+
+    def get_tag(self, key: str, default: str=None) -> str:
+        """Gets the value of a single tag without decoding all of them.
+
+        If the tags have already been decoded, this is just Message.tags.get(key, default).
+
+
+        Parameters
+        ------------
+        key : str
+            The name of the tag. ex: 'user-id'
+
+        default : str (optional)
+            What to return if the line doesn't have that tag. Defaults to None.
+
+
+        Returns
+        ---------
+        str
+            The tag's unescaped value.
+        """
+        if self._tags is not None or not self._tag_end:
+            return self.tags.get(key, default)
+
+        raw = self.raw
+        if raw.startswith(key + '=', 1):
+            start = 1
+        else:
+            start = raw.find(';' + key + '=', 1, self._tag_end) + 1
+            if not start:
+                return default
+        start += len(key) + 1
+        end = raw.find(';', start, self._tag_end)
+        return unescape_tag(raw[start:end if end != -1 else self._tag_end])
+
+
+
+    @property
+    def prefix(self) -> str:
+        start = self._tag_end + 1 if self._tag_end else 0
+        if not self.raw.startswith(':', start):
+            return None
+        end = self.raw.find(' ', start)
+        return self.raw[start+1:end] if end != -1 else self.raw[start+1:].rstrip('\r\n')
+
+
+
+    @property
+    def nick(self) -> str:
+        prefix = self.prefix
+        if prefix is None:
+            return None
+        return prefix.partition('!')[0]
+
+
+
+    @property
+    def channel(self) -> str:
+        """
+        the channel the line is about (without the '#') if the first parameter is a channel, else None
+        """
+        if self.params and self.params[0].startswith('#'):
+            return self.params[0][1:]
+        return None
+
+
+
+    def __repr__(self):
+        return f'Message(command={self.command!r}, prefix={self.prefix!r}, params={self.params!r}, trailing={self.trailing!r})'
+
+
+
+def parse(line: str) -> Message:
+    """Parses a raw line from twitch IRC into a Parser.Message .
+
+    Works its way through the line from left to right just once: tags, then prefix, then command and
+    parameters, then the trailing parameter. Works for every kind of line, not just chat messages.
+    The tags are only found here, they aren't decoded until Parser.Message.tags is used.
+
+
+    Parameters
+    ------------
+    line : str
+        The raw line. The '\\r\\n' at the end is optional.
+
+        ex: '@badges=;display-name=SomeViewer :someviewer!someviewer@someviewer.tmi.twitch.tv PRIVMSG #somechannel :hello world\\r\\n'
+
+
+    Returns
+    ---------
+    Parser.Message
+        The parsed line.
+    """
+    end = len(line)
+    while end and line[end-1] in '\r\n':
+        end -= 1
+    pos = 0
+
+    tag_end = 0
+    if line.startswith('@'):
+        tag_end = line.find(' ', 1, end)
+        if tag_end == -1:
+            tag_end = end
+        pos = tag_end + 1
+
+    if line.startswith(':', pos):   # skip over the prefix, Parser.Message finds it again if it's needed
+        space = line.find(' ', pos, end)
+        pos = space + 1 if space != -1 else end
+
+    trailing = None
+    colon = line.find(' :', pos, end)
+    if colon != -1:
+        trailing = line[colon+2:end]
+        end = colon
+
+    params = line[pos:end].split()
+    command = sys.intern(params[0]) if params else ''
+    return Message(line, tag_end, command, tuple(map(sys.intern, params[1:])), trailing)
+
+
+
+def parse_command(line: str) -> str:
+    """Finds just the command of a raw line from twitch IRC without parsing anything else.
+
+    Useful for deciding whether a line is worth parsing at all.
+
+
+    Parameters
+    ------------
+    line : str
+        The raw line. ex: '@badges=;color= :someviewer!someviewer@someviewer.tmi.twitch.tv PRIVMSG #somechannel :hi'
+
+
+    Returns
+    ---------
+    str
+        The command. ex: 'PRIVMSG'
+    """
+    pos = 0
+    if line.startswith('@'):
+        pos = line.find(' ') + 1
+        if not pos:
+            return ''
+    if line.startswith(':', pos):
+        pos = line.find(' ', pos) + 1
+        if not pos:
+            return ''
+    end = line.find(' ', pos)
+    return line[pos:end if end != -1 else len(line)].rstrip('\r\n')
\ No newline at end of file
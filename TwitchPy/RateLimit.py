@@ -0,0 +1,436 @@
+# python standard modules
+from collections import deque
+import multiprocessing
+import time
+
+
+
+"""
+limits how often something can happen
+token buckets are used for command cooldowns: https://en.wikipedia.org/wiki/Token_bucket
+a sliding window is used for messages sent to chat, since that's how twitch counts them: https://dev.twitch.tv/docs/irc/guide#rate-limits
+"""
+
+
+
+__all__ = ['PRIORITIES', 'BucketStore', 'SendQueue', 'SharedWindow']
+
+
+
+# the lanes of a SendQueue, from first to last to be sent
+PRIORITIES = ('high', 'normal', 'low')
+
+
+
+class BucketStore:
+    """Keeps a token bucket for every key (like a username or channel) that's been used recently.
+
+    Every bucket starts full with capacity tokens and refills at a steady rate of capacity tokens every
+    per seconds. Each use takes one token, and once a bucket is empty, it has to wait for a token to
+    refill before it can be used again.
+
+    Buckets that have been left alone long enough to refill all the way are the same as new buckets,
+    so they're thrown away to keep the store small no matter how many keys it's seen.
+
+
+    Parameters
+    ------------
+    capacity : int
+        The most uses in a row before having to wait.
+
+    per : float
+        How many seconds it takes for an empty bucket to refill all the way.
+
+
+    Attributes
+    ------------
+    See parameters
+
+
+    Examples
+    ------------
+    >>> buckets = BucketStore(3, 30)    # 3 uses every 30 seconds
+    >>> buckets.take('someviewer')
+    0.0
+    >>> buckets.take('someviewer')
+    0.0
+    >>> buckets.take('someviewer')
+    0.0
+    >>> buckets.take('someviewer')      # has to wait about 10 seconds for the next token
+    9.99...
+    """
+    def __init__(self, capacity: int, per: float):
+        # variables given
+        self.capacity = capacity
+        self.per = per
+
+        # variables created
+        self._rate = capacity / per     # tokens refilled every second
+        self._buckets = dict()          # {key: (tokens, time last used)} least recently used first
+
+
+
+    def take(self, key, now: float=None) -> float:
+        """Tries to take a token from a key's bucket.
+
+
+        Parameters
+        ------------
+        key
+            Whatever the bucket is for. ex: a username
+
+        now : float (optional)
+            The current time from time.monotonic(). Only used so that many buckets can be checked at the same time.
+
+
+        Returns
+        ---------
+        float
+            0.0 if a token was taken, otherwise how many seconds until the next token is ready.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._evict(now)
+
+        entry = self._buckets.pop(key, None)   # taken out and put back in so the least recently used buckets stay first
+        if entry is None:
+            tokens = self.capacity
+        else:
+            tokens = min(self.capacity, entry[0] + (now - entry[1]) * self._rate)
+
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / self._rate
+
+
+
+    def _evict(self, now: float):
+        """
+        throws away the buckets that would be full by now, which are always the least recently used ones
+        """
+        buckets = self._buckets
+        while buckets:
+            key = next(iter(buckets))
+            if now - buckets[key][1] < self.per:
+                break
+            del buckets[key]
+
+
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+
+
+
+
+class _Window:
+    """
+    when each message in the last per seconds was sent, oldest first, for a SendQueue (or a few that share it) in one process
+    """
+    def __init__(self):
+        self._times = deque()
+
+
+
+    def reserve(self, limit: int, per: float, now: float) -> float:
+        """
+        counts a message as sent now if fewer than limit were sent in the last per seconds
+        returns 0.0 if it was, otherwise how many seconds until one can be
+        """
+        times = self._times
+        while times and now - times[0] >= per:
+            times.popleft()
+        if len(times) < limit:
+            times.append(now)
+            return 0.0
+        return times[len(times) - limit] + per - now    # when enough old messages fall out of the window
+
+
+
+    def add(self, now: float):
+        self._times.append(now)
+
+
+
+    def count(self, per: float, now: float) -> int:
+        return sum(1 for sent in self._times if now - sent < per)
+
+
+
+
+
+
+class SendQueue:
+    """Holds messages waiting to be sent and makes sure no more than limit of them are sent every per seconds.
+
+    Messages wait in one of three lanes: 'high', 'normal', and 'low'. Whenever a message can be sent, the
+    oldest message in the highest lane that has any goes first.
+
+
+    Parameters
+    ------------
+    limit : int (optional)
+        The most messages that can be sent in any per seconds. Defaults to 20, twitch's limit for
+        users that aren't a moderator or broadcaster of the channel.
+
+    per : float (optional)
+        How many seconds limit applies to. Defaults to 30.
+
+
+    Attributes
+    ------------
+    See parameters. limit can be changed at any time.
+
+    sent : int
+        How many messages have been sent.
+
+    throttled : int
+        How many messages had to wait because limit messages were already sent in the last per seconds.
+        Each message is only counted once, no matter how long it waited.
+
+
+    Note
+    ------------
+    This doesn't send anything itself. It only decides what should be sent next and when. See Websocket.IRC.send()
+    """
+    def __init__(self, limit: int=20, per: float=30):
+        # variables given
+        self.limit = limit
+        self.per = per
+
+        # variables created
+        self.sent = 0
+        self.throttled = 0
+        self._lanes = {priority: deque() for priority in PRIORITIES}   # (when it was put in the queue, message)
+        self._window = _Window()    # or a SharedWindow, see SendQueue.share_limit_with()
+        self._reserved = False      # if wait_time() already counted the next message as sent
+        self._blocked_until = 0.0   # messages put in the queue before this had to wait for the limit
+        self._waits = {priority: [0, 0.0, 0.0] for priority in PRIORITIES}    # [messages sent, total seconds waited, most seconds waited]
+
+
+
+    def put(self, item, priority: str='normal'):
+        """Adds a message to the end of its lane.
+
+
+        Parameters
+        ------------
+        item
+            The message to send.
+
+        priority : {'high', 'normal', 'low'} (optional)
+            Which lane to put the message in. Defaults to 'normal'.
+        """
+        self._lanes[priority].append((time.monotonic(), item))
+
+
+
+    def wait_time(self, now: float=None) -> float:
+        """How long until the next message can be sent.
+
+        If it can be sent now, it's counted towards the limit right away (so that nothing sharing the limit can
+        take its place), so call SendQueue.pop() next.
+
+
+        Parameters
+        ------------
+        now : float (optional)
+            The current time from time.monotonic()
+
+
+        Returns
+        ---------
+        float
+            0.0 if a message can be sent now, otherwise how many seconds until one can be.
+        """
+        if now is None:
+            now = time.monotonic()
+        if self._reserved:
+            return 0.0
+        if not (delay := self._window.reserve(self.limit, self.per, now)):
+            self._reserved = True
+            return 0.0
+        self._blocked_until = max(self._blocked_until, now + delay)
+        return delay
+
+
+
+    def pop(self, now: float=None):
+        """Takes the next message out of the queue and counts it as sent.
+
+        Only call this after SendQueue.wait_time() says a message can be sent.
+
+
+        Parameters
+        ------------
+        now : float (optional)
+            The current time from time.monotonic()
+
+
+        Returns
+        ---------
+        The next message.
+
+
+        Raises
+        ---------
+        IndexError
+            Raised if there aren't any messages waiting.
+        """
+        if now is None:
+            now = time.monotonic()
+        for priority, lane in self._lanes.items():
+            if lane:
+                queued, item = lane.popleft()
+                if not self._reserved:
+                    self._window.add(now)
+                self._reserved = False
+                self.sent += 1
+                if queued < self._blocked_until:
+                    self.throttled += 1
+                waits = self._waits[priority]
+                waits[0] += 1
+                waits[1] += now - queued
+                waits[2] = max(waits[2], now - queued)
+                return item
+        raise IndexError('pop from an empty SendQueue')
+
+
+
+    def clear(self):
+        """Throws away every message that's waiting. Messages that were already sent still count towards the limit.
+        """
+        for lane in self._lanes.values():
+            lane.clear()
+
+
+
+    def share_limit_with(self, other):
+        """Makes messages sent from either queue count towards both of their limits.
+
+        Twitch's limits are for the whole account, so queues that send on different connections
+        with the same account have to count each other's messages.
+
+
+        Parameters
+        ------------
+        other : TwitchPy.RateLimit.SendQueue or TwitchPy.RateLimit.SharedWindow
+            The queue to share with, or a window shared with queues in other processes.
+        """
+        self._window = other if isinstance(other, SharedWindow) else other._window
+
+
+
+    def __len__(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_stats(self) -> dict:
+        """
+        how many messages have been sent, how many of them had to wait for the limit ('throttled'), how many are waiting in each lane ('queued'),
+        how many seconds messages from each lane waited between being put in the queue and being sent on average and at most ('wait'),
+        the limit, and how many messages were sent in the last per seconds ('in_window')
+        """
+        return {
+            'sent': self.sent,
+            'throttled': self.throttled,
+            'queued': {priority: len(lane) for priority, lane in self._lanes.items()},
+            'wait': {priority: {'average': total / count if count else 0.0, 'max': most}
+                     for priority, (count, total, most) in self._waits.items()},
+            'limit': self.limit,
+            'per': self.per,
+            'in_window': self._window.count(self.per, time.monotonic()),
+        }
+
+
+
+
+
+
+class SharedWindow:
+    """Keeps track of when messages were sent for SendQueues in different processes, so they can share one limit.
+
+    Has to be made before the processes are forked. Give it to each process's queues with
+    SendQueue.share_limit_with() and set index to a different number in each process.
+
+    Every process uses the lowest limit that any of them has, since a process might not know that
+    the limit should be lower (like when the bot isn't a moderator of a channel another process is in).
+
+
+    Parameters
+    ------------
+    processes : int (optional)
+        How many processes share it. Defaults to 1.
+
+    limit : int (optional)
+        The limit every process starts with, until it sends its first message. Defaults to 20.
+
+    size : int (optional)
+        How many of the latest messages are remembered, which is also the highest limit it can keep to. Defaults to 1000.
+
+    context : multiprocessing context (optional)
+        The context the processes are made with. Defaults to the multiprocessing module's default.
+
+
+    Attributes
+    ------------
+    index : int
+        Which process this is, from 0 to processes - 1. Defaults to 0.
+    """
+    def __init__(self, processes: int=1, limit: int=20, size: int=1000, context=None):
+        context = context or multiprocessing
+
+        # variables given
+        self.size = size
+
+        # variables created
+        self.index = 0
+        self._lock = context.Lock()
+        self._times = context.Array('d', size, lock=False)     # when the latest size messages were sent, oldest overwritten first
+        self._sent = context.Value('q', 0, lock=False)          # how many messages have ever been sent, which decides where the next one goes
+        self._limits = context.Array('i', [limit] * processes, lock=False)     # the limit each process last used
+
+
+
+    def reserve(self, limit: int, per: float, now: float) -> float:
+        """
+        counts a message as sent now if fewer than the lowest limit of every process were sent in the last per seconds
+        returns 0.0 if it was, otherwise how many seconds until one can be
+        now is looked up again while holding the lock so that the times stay in order no matter which process sends
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._limits[self.index] = limit
+            limit = min(min(self._limits), self.size)
+            sent = self._sent.value
+            if sent >= limit:
+                oldest = self._times[(sent - limit) % self.size]   # the limit-th latest message
+                if now - oldest < per:
+                    return oldest + per - now
+            self._times[sent % self.size] = now
+            self._sent.value = sent + 1
+            return 0.0
+
+
+
+    def add(self, now: float):
+        with self._lock:
+            sent = self._sent.value
+            self._times[sent % self.size] = time.monotonic()
+            self._sent.value = sent + 1
+
+
+
+    def count(self, per: float, now: float) -> int:
+        with self._lock:
+            sent = self._sent.value
+            return sum(1 for i in range(max(0, sent - self.size), sent) if now - self._times[i % self.size] < per)
\ No newline at end of file
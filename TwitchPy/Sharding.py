@@ -0,0 +1,423 @@
+# python standard modules
+import asyncio
+import time
+
+# TwitchPy modules
+from .utilities import *
+from .Websocket import IRC
+
+
+
+"""
+spreads channels across more than one IRC connection
+one connection can only read so fast, so busy channels are split up by how many messages they get
+"""
+
+
+
+__all__ = ['ShardPool']
+
+
+
+class ShardPool:
+    """Spreads channels across several IRC connections (shards) and moves busy channels around to keep them even.
+
+    Every shard is a Websocket.IRC with the same account, command router, and event handler, so commands and
+    events work the same no matter which shard a channel is on. Every interval seconds, the pool works out how
+    many messages each channel gets per second and moves channels from the busiest shard to the least busy one.
+    A moving channel is joined on its new shard before it's left on the old one, and its chat history moves with it.
+    Until twitch says the old shard has left, both shards get the channel's messages, and each message (going by its
+    id) is only handled by whichever shard gets it first.
+
+    Has the same send(), join(), part(), channels, and chat_history as Websocket.IRC, so it can be used in its place.
+    See TwitchBot.Client's shards keyword argument.
+
+
+    Parameters
+    ------------
+    logger : Logger.Logger
+        The bot's custom logger.
+
+    router : Commands.Router
+        Decides which cog's command (if any) to execute for each chat message.
+
+    events : Event.Handler
+        The event handler.
+
+    token : str
+        The bot's oauth token.
+
+    user : str
+        The bot's username.
+
+    channel : str
+        The main channel to connect to. This is where ShardPool.send() sends messages unless it's told otherwise.
+
+    chatlimit : int
+        The maximum number of chat messages that each channel's chat history should hold on to.
+
+    channels : [str] (optional)
+        Other channels to join besides channel.
+
+    shards : int (optional)
+        How many connections to use. Never more than the number of channels to start with. Defaults to 2.
+
+
+    Attributes
+    ------------
+    channel : str
+        See parameters.
+
+    shards : [TwitchPy.Websocket.IRC]
+        The connections. The first one is always the one with the main channel.
+
+    interval : float
+        How many seconds between checking whether channels need to be moved. Defaults to 60.
+
+    tolerance : float
+        How much busier than average (0.25 means 25%) the busiest shard can be before channels are moved. Defaults to 0.25.
+
+    max_moves : int
+        The most channels moved every interval. Defaults to 5.
+
+    smoothing : float
+        How much of each channel's message rate comes from the last interval instead of the ones before it,
+        from 0 to 1. Lower numbers keep a channel that's busy for just a moment from being moved. Defaults to 0.5.
+
+    join_timeout : float
+        How many seconds to wait for a moving channel to be joined on its new shard before giving up. Defaults to 10.
+
+    moves : int
+        How many channels have been moved.
+
+
+    Raises
+    ---------
+    ValueError
+        Raised if shards is less than 1.
+
+
+    Note
+    ------------
+    Twitch's rate limits are for the whole account, so every shard counts the messages and JOINs sent by the others,
+    and the higher message limit for moderators is only used if the bot is a moderator of every channel on every shard.
+    """
+    def __init__(self, logger, router, events, token: str, user: str, channel: str, chatlimit: int, channels: [str]=None, shards: int=2):
+        if shards < 1:
+            raise ValueError(f'TwitchPy.Sharding.ShardPool: shards must be at least 1, not {shards}')
+
+        # variables given
+        self.logger = logger
+        self.channel = channel.lower()
+
+        # variables created
+        names = list(dict.fromkeys([self.channel] + [name.lower() for name in channels or []]))     # no duplicates, main channel first
+        count = min(shards, len(names))
+        self.shards = []
+        for i in range(count):
+            group = names[i::count]
+            self.shards.append(IRC(logger, router, events, token, user, group[0], chatlimit, group[1:]))
+        for shard in self.shards[1:]:
+            shard.outgoing.share_limit_with(self.shards[0].outgoing)
+            shard.joins.share_limit_with(self.shards[0].joins)
+        for shard in self.shards:
+            shard._peers = self.shards
+        self.interval = 60
+        self.tolerance = 0.25
+        self.max_moves = 5
+        self.smoothing = 0.5
+        self.join_timeout = 10
+        self.moves = 0
+        self._rates = dict()    # {channel: messages per second}
+        self._counts = dict()   # {channel: Channel.messages when the rates were last worked out}
+        self._sampled = None    # when the rates were last worked out
+
+
+
+    async def connect(self):
+        '''Connects every shard to twitch IRC.
+        '''
+        await asyncio.gather(*(shard.connect() for shard in self.shards))
+
+
+
+    async def run(self):
+        '''Listens to every shard until the bot stops and moves channels around whenever the shards get uneven.
+
+        Each shard reconnects by itself if its connection drops. See Websocket.IRC.run()
+        '''
+        tasks = [asyncio.create_task(shard.run()) for shard in self.shards]
+        tasks.append(asyncio.create_task(self._rebalance_loop()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)    # lets every shard disconnect
+
+
+
+    async def disconnect(self):
+        '''Closes every shard's connection to twitch IRC.
+        '''
+        await asyncio.gather(*(shard.disconnect() for shard in self.shards))
+
+
+
+    async def send(self, msg: str, priority: str='normal', channel: str=None):
+        '''Sends a message to twitch chat on whichever shard the channel is on.
+
+        See Websocket.IRC.send()
+        '''
+        if channel is not None and (err_msg := check_param(channel, str)):
+            raise TypeError(f'TwitchPy.Sharding.ShardPool.send(): {err_msg}')
+        channel = channel.lower() if channel is not None else self.channel
+        shard = self._shard_of(channel) or self.shards[0]
+        await shard.send(msg, priority, channel)
+
+
+
+    async def join(self, channel: str):
+        '''Joins another channel's chat on the least busy shard.
+
+        See Websocket.IRC.join()
+        '''
+        # input sanitization
+        if (err_msg := check_param(channel, str)):
+            raise TypeError(f'TwitchPy.Sharding.ShardPool.join(): {err_msg}')
+
+        channel = channel.lower()
+        if self._shard_of(channel) is None:
+            await min(self.shards, key=lambda shard: (self._load(shard), len(shard.channels))).join(channel)
+
+
+
+    async def part(self, channel: str):
+        '''Leaves a channel's chat and forgets its chat history.
+
+        Raises
+        ---------
+        TypeError
+            Raised if parameters are not the correct data type.
+
+        ValueError
+            Raised if channel is the main channel or the only channel left on its shard.
+        '''
+        # input sanitization
+        if (err_msg := check_param(channel, str)):
+            raise TypeError(f'TwitchPy.Sharding.ShardPool.part(): {err_msg}')
+        channel = channel.lower()
+        if channel == self.channel:
+            raise ValueError(f"TwitchPy.Sharding.ShardPool.part(): can't leave the main channel '{channel}', use TwitchBot.Client.change_channel() instead")
+
+        if (shard := self._shard_of(channel)) is not None:
+            await self._leave(shard, channel)
+
+
+
+    async def _move(self, channel: str):
+        '''
+        makes channel the main channel and leaves the old one
+        note: the user should use TwitchBot.Client.change_channel() because we also need to update information in API.Helix
+        '''
+        old, channel = self.channel, channel.lower()
+        if old == channel:
+            return
+        shard = self._shard_of(old)
+        if self._shard_of(channel) is None:
+            await shard.join(channel)   # the old main channel's shard, so it's never left empty
+        self.channel = channel
+        await self._leave(shard, old)
+
+
+
+    async def _leave(self, shard: IRC, channel: str):
+        """
+        leaves a channel on a shard, picking another main channel for the shard first if it has to
+        """
+        self._replace_main(shard, channel)
+        await shard.part(channel)
+
+
+
+    @staticmethod
+    def _replace_main(shard: IRC, channel: str):
+        """
+        picks another main channel for a shard if channel is its main channel, since IRC.part() can't leave that one
+        """
+        if shard.channel == channel:
+            others = [name for name in shard.channels if name != channel]
+            if not others:
+                raise ValueError(f"TwitchPy.Sharding.ShardPool.part(): can't leave '{channel}', it's the only channel on its shard")
+            shard.channel = others[0]
+
+
+
+    def _shard_of(self, channel: str) -> IRC:
+        """
+        the shard a channel is on, or None if it isn't on any
+        """
+        for shard in self.shards:
+            if channel in shard.channels:
+                return shard
+        return None
+
+
+
+    def _load(self, shard: IRC) -> float:
+        """
+        how many messages per second a shard gets from all of its channels together
+        """
+        return sum(self._rates.get(name, 0.0) for name in shard.channels)
+
+
+
+    async def _rebalance_loop(self):
+        """
+        every self.interval seconds, works out how busy every channel is and moves channels off the busiest shards
+        """
+        self._sample()
+        while True:
+            await asyncio.sleep(self.interval)
+            self._sample()
+            for channel, old, new in self._plan():
+                await self._move_channel(channel, old, new)
+
+
+
+    def _sample(self):
+        """
+        works out how many messages per second each channel got since the last time this was called
+        the new rate is mixed with the old one (an exponential moving average) so a short burst doesn't count for too much
+        a channel that's moving is on two shards at once, which each only count the messages they handled, so those are added up
+        """
+        now = time.monotonic()
+        elapsed = now - self._sampled if self._sampled is not None else 0
+        self._sampled = now
+
+        counts = dict()
+        for shard in self.shards:
+            for name, channel in shard.channels.items():
+                counts[name] = counts.get(name, 0) + channel.messages
+        if elapsed:
+            rates = dict()
+            for name, count in counts.items():
+                rate = (count - self._counts.get(name, count)) / elapsed
+                old = self._rates.get(name)
+                rates[name] = rate if old is None else old + self.smoothing * (rate - old)
+            self._rates = rates
+        self._counts = counts
+
+
+
+    def _plan(self) -> [(str, IRC, IRC)]:
+        """
+        decides which channels to move from the busiest shard to the least busy one
+        each move picks the channel that gets the two shards closest to even, and stops once nothing can make them more even
+        """
+        if len(self.shards) < 2:
+            return []
+        loads = {shard: self._load(shard) for shard in self.shards}
+        sizes = {shard: len(shard.channels) for shard in self.shards}
+        average = sum(loads.values()) / len(loads)
+
+        moves = []
+        moving = set()
+        for _ in range(self.max_moves):
+            busiest = max(self.shards, key=loads.get)
+            idlest = min(self.shards, key=loads.get)
+            gap = loads[busiest] - loads[idlest]
+            if loads[busiest] <= average * (1 + self.tolerance) or sizes[busiest] < 2:
+                break
+            # moving a channel only helps if it gets fewer messages than the gap between the two shards
+            candidates = [name for name in busiest.channels
+                          if name not in moving and name != self.channel and 0 < self._rates.get(name, 0.0) < gap]
+            if not candidates:
+                break
+            channel = min(candidates, key=lambda name: abs(gap / 2 - self._rates[name]))
+
+            moves.append((channel, busiest, idlest))
+            moving.add(channel)
+            loads[busiest] -= self._rates[channel]
+            loads[idlest] += self._rates[channel]
+            sizes[busiest] -= 1
+            sizes[idlest] += 1
+        return moves
+
+
+
+    async def _move_channel(self, channel: str, old: IRC, new: IRC):
+        """
+        moves a channel from one shard to another without missing or doubling up on any messages
+        the new shard joins while the old one keeps handling the channel, then the old shard leaves and keeps handling it
+        until twitch says it's gone. in between, both shards share the ids of the messages they've handled to skip repeats.
+        the ids are kept a little longer after that, in case the new shard's connection is behind the old one's
+        """
+        if (before := old.channels.get(channel)) is None or channel in new.channels:
+            return
+        before._seen = dict()
+        await new.join(channel)
+        after = new.channels[channel]
+        after._seen = before._seen
+        after.chat_history = before.chat_history
+
+        deadline = time.monotonic() + self.join_timeout
+        while not after.joined:
+            if time.monotonic() > deadline or new.channels.get(channel) is not after:
+                await self.logger.log(30, 'error', f'gave up moving channel {channel} to shard {self.shards.index(new)}')
+                if new.channels.get(channel) is after:
+                    await new.part(channel)
+                before._seen = None
+                return
+            await asyncio.sleep(0.05)
+
+        self._replace_main(old, channel)
+        if not await old._part_when_left(channel, self.join_timeout):
+            await self.logger.log(30, 'error', f"twitch didn't say shard {self.shards.index(old)} left channel {channel}, moving it anyway")
+        after.messages += before.messages
+
+        def forget(seen=after._seen):
+            if after._seen is seen:     # unless the channel has started moving again since
+                after._seen = None
+        asyncio.get_running_loop().call_later(self.join_timeout, forget)
+        self.moves += 1
+        await self.logger.log(19, 'basic', f'moved channel {channel} from shard {self.shards.index(old)} to shard {self.shards.index(new)}')
+
+
+
+    @property
+    def channels(self) -> dict:
+        """
+        every channel on every shard, by name
+        """
+        return {name: channel for shard in self.shards for name, channel in shard.channels.items()}
+
+
+
+    @property
+    def chat_history(self):
+        return self._shard_of(self.channel).channels[self.channel].chat_history
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_stats(self) -> [dict]:
+        """
+        for each shard: how many channels it has, how many messages per second it gets ('rate'),
+        how many seconds behind chat it is ('lag'), how many bytes are waiting to be sent, and how many times it's reconnected
+        """
+        return [{
+            'channels': len(shard.channels),
+            'rate': self._load(shard),
+            'lag': shard.lag,
+            'buffered_bytes': shard.get_buffered_bytes(),
+            'reconnects': shard.reconnects,
+        } for shard in self.shards]
+
+
+
+    def get_shards(self) -> [IRC]:
+        return self.shards
\ No newline at end of file
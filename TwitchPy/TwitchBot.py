@@ -8,16 +8,19 @@
 # python standard module
 import asyncio
 import json
+import multiprocessing
 import sys
 
 # TwitchPy modules
 from .API import Helix
-from .Commands import Cog
+from .Commands import Cog, Executor, Router
 from .errors import *
 from .Events import Handler
 from .Logger import Logger
+from .Sharding import ShardPool
 from .utilities import *
 from .Websocket import IRC
+from .Workers import Supervisor
 
 
 
@@ -42,10 +45,27 @@ class Client:
         The bot's client ID.
 
     channel : str
-        The channel you want the bot to connect to.
+        The channel you want the bot to connect to. This is the channel API.Helix looks up and where
+        Websocket.IRC.send() sends messages unless it's told otherwise.
+
+    channels : [str] (optional)
+        Other channels you want the bot to join. Every channel shares the same connection. See Websocket.IRC.join()
 
     chatlimit : int
-        The maximum number of chat messages to hold on to. See Websocket.IRC
+        The maximum number of chat messages to hold on to for each channel. See Websocket.IRC
+
+    max_commands : int (optional)
+        The most commands that can run at the same time. Commands from the same viewer always run one at a time
+        in the order they were sent. Defaults to 10. See Commands.Executor
+
+    shards : int (optional)
+        How many connections to twitch IRC to spread the channels across. One connection can only read so fast,
+        so bots in a lot of busy channels should use more. Defaults to 1. See Sharding.ShardPool
+
+    workers : int (optional)
+        How many processes to spread the channels across, so the bot can use more than one CPU core.
+        Each worker has its own connection (or shards) to twitch. Defaults to 1, which runs everything in this process.
+        Only works on platforms with os.fork() (not Windows). See Workers.Supervisor
 
     logger : Logger.Logger (optional)
         The bot's custom logger. If not given, TwitchPy will give you a very basic logger (see Logger.Logger preset='default').
@@ -70,23 +90,35 @@ class Client:
     command_cogs : (Command.Cog)
         A set of all the command cogs you added.
 
+    router : Commands.Router
+        Decides which cog a chat message is meant for. Rebuilt whenever you call TwitchBot.Client.add_cogs()
+
+    executor : Commands.Executor
+        Runs commands as their own tasks so slow commands don't stop the bot from reading chat.
+
     API : API.Helix
         The API handler.
 
     IRC : Websocket.IRC
-        The IRC handler.
+        The IRC handler. If shards is more than 1, this is a Sharding.ShardPool instead, which works the same way.
 
     tasks : list
         A list of functions to execute concurrently with the bot.
         See TwitchBot.Client.run() for more info.
 
+    supervisor : Workers.Supervisor
+        Watches over the worker processes while the bot runs. None unless workers is more than 1.
+
 
     Raises
     ---------
     TypeError
         Raised if kwargs are not the correct data type.
+
+    ValueError
+        Raised if max_commands, shards, or workers is less than 1, or if workers is more than 1 on a platform without os.fork().
     """
-    def __init__(self, *, token: str, user: str, client_id: str, channel: str, chatlimit: int=None, logger=Logger(preset='default'), eventhandler=Handler()):
+    def __init__(self, *, token: str, user: str, client_id: str, channel: str, channels: list=[], chatlimit: int=None, max_commands: int=10, shards: int=1, workers: int=1, logger=Logger(preset='default'), eventhandler=Handler()):
         # input sanitization
         if (err_msg := check_param(token, str)):
             raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
@@ -96,8 +128,26 @@ class Client:
             raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
         if (err_msg := check_param(channel, str)):
             raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
+        channels = makeiter(channels)
+        for name in channels:
+            if (err_msg := check_param(name, str)):
+                raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
         if chatlimit != None and (err_msg := check_param(chatlimit, int)):
             raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
+        if (err_msg := check_param(max_commands, int)):
+            raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
+        if max_commands < 1:
+            raise ValueError(f'TwitchPy.TwitchBot.Client: max_commands must be at least 1, not {max_commands}')
+        if (err_msg := check_param(shards, int)):
+            raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
+        if shards < 1:
+            raise ValueError(f'TwitchPy.TwitchBot.Client: shards must be at least 1, not {shards}')
+        if (err_msg := check_param(workers, int)):
+            raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
+        if workers < 1:
+            raise ValueError(f'TwitchPy.TwitchBot.Client: workers must be at least 1, not {workers}')
+        if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            raise ValueError('TwitchPy.TwitchBot.Client: workers needs os.fork(), which this platform does not have')
         if (err_msg := check_param(logger, Logger)):
             raise TypeError(f'TwitchPy.TwitchBot.Client: {err_msg}')
         if (err_msg := check_param(eventhandler, Handler)):
@@ -106,6 +156,11 @@ class Client:
         # variables given
         self.events = eventhandler
         self.logger = logger
+        self.workers = workers
+        self._token = token
+        self._user = user
+        self._chatlimit = chatlimit
+        self._shards = shards
 
         # logger setup
         self.logger.set_eventhandler(self.events)
@@ -113,10 +168,13 @@ class Client:
 
         # variables created
         self.command_cogs = set()
+        self.executor = Executor(max_commands)
+        self.router = Router(self.logger, self.events, self.executor)
         self.API = Helix(logger=self.logger, channel=channel, cid=client_id)
-        self.IRC = IRC(logger=self.logger, commands=self.command_cogs, events=self.events, token=token, user=user, channel=channel, chatlimit=chatlimit)
+        self.IRC = self._create_IRC(channel, channels)
         self.events._init_events(logger=self.logger, API=self.API, IRC=self.IRC)
         self.tasks = []     # for asyncio concurrency
+        self.supervisor = None
         self._listen_loop = None
 
         # log
@@ -126,6 +184,17 @@ class Client:
 
 
 
+    def _create_IRC(self, channel: str, channels: [str]):
+        """
+        makes the IRC handler, or a pool of them if there's more than one shard
+        worker processes use this to make one for just their own channels
+        """
+        if self._shards > 1:
+            return ShardPool(logger=self.logger, router=self.router, events=self.events, token=self._token, user=self._user, channel=channel, chatlimit=self._chatlimit, channels=channels, shards=self._shards)
+        return IRC(logger=self.logger, router=self.router, events=self.events, token=self._token, user=self._user, channel=channel, chatlimit=self._chatlimit, channels=channels)
+
+
+
     def add_cogs(self, cogs: list):
         """Adds commands to the bot.
 
@@ -156,6 +225,8 @@ class Client:
             self.command_cogs.add(cog)
             asyncio.run(self.logger.log(11, 'init', f'successfully added cog {type(cog).__name__}'))
 
+        self.router.add_cogs(cogs)
+
 
 
     def run(self, funcs: list=[]):
@@ -178,27 +249,45 @@ class Client:
                 * Must have at least one call to asyncio.sleep(x) where x is an amount of time in seconds. This is what allows the concurrency. If you don't have this, the bot will get hung up on one of the tasks and not function properly.
                 * Must **NOT** take any arguments.
 
+            If the bot has more than one worker, these only run in worker 0, which has the main channel.
+
 
         Raises
         --------
         TypeError
             Raised if paramaters are not the correct data type.
         """
+        funcs = makeiter(funcs)
+
+        # input sanitization
+        for func in funcs:
+            if not iscallable(func):
+                raise TypeError(f"TwitchPy.TwitchBot.Client.run(): funcs expects 'function' not {type(func)}")
+
+        if self.workers > 1:
+            self.supervisor = Supervisor(self, self.workers)
+            self.supervisor.run(funcs)
+        else:
+            self._run(funcs)
+
+
+
+    def _run(self, funcs: list) -> bool:
+        """
+        runs the bot in this process until it dies
+        returns True if it was killed on purpose (see self.kill()), False if it died from an error
+        """
+        expected = False
         try:
             asyncio.run(self.logger.log(20, 'basic', 'starting bot...'))
             self.events.on_run()
-            funcs = makeiter(funcs)
-
-            # input sanitization
-            for func in funcs:
-                if not iscallable(func):
-                    raise TypeError(f"TwitchPy.TwitchBot.Client.run(): funcs expects 'function' not {type(func)}")
 
             self._listen_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self._listen_loop)
             self._listen_loop.run_until_complete(self.IRC.connect())
             self._listen_loop.run_until_complete(self._start(funcs))
         except ExpectedExit as e:
+            expected = True
             self._listen_loop.run_until_complete(self.events.on_expected_death())
         except Exception as err:
             exc_info = sys.exc_info()
@@ -207,7 +296,10 @@ class Client:
         finally:
             self._listen_loop.run_until_complete(self.events.on_death())
             self._listen_loop.run_until_complete(self.logger.log(20, 'basic', 'bot is shutting down...'))
+            self._listen_loop.run_until_complete(self.API.close())
             self._listen_loop.close()
+            self.logger.shutdown()
+        return expected
 
 
 
@@ -217,15 +309,25 @@ class Client:
         https://docs.python.org/3/library/asyncio-task.html#running-tasks-concurrently
         see self.run() for info on funcs args
         """
-        self.tasks.append(asyncio.create_task(self.IRC.listen()))
+        self.tasks.append(asyncio.create_task(self.IRC.run()))     # reconnects by itself if the connection drops
+        self.tasks.append(asyncio.create_task(self.executor._watch()))     # so exceptions raised by commands still stop the bot
         for func in funcs:
             self.tasks.append(asyncio.create_task(func()))
-        await asyncio.gather(*self.tasks)
+        try:
+            await asyncio.gather(*self.tasks)
+        finally:
+            # whichever task stopped the bot, the rest are still running, so stop them and let IRC.run() disconnect
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
 
 
 
     async def change_channel(self, channel: str):
-        """Moves the bot from one twitch channel to another.
+        """Moves the bot from its main twitch channel to another.
+
+        The bot leaves the old main channel but stays in every other channel it's in.
+        To be in more than one channel at once, see Websocket.IRC.join()
 
         Parameters
         -----------
@@ -242,11 +344,11 @@ class Client:
 
         # input sanitization
         if (err_msg := check_param(channel, str)):
-            raise TypeEror(f'TwitchPy.TwitchBot.Client.change_channel(): {err_msg}')
+            raise TypeError(f'TwitchPy.TwitchBot.Client.change_channel(): {err_msg}')
 
         self.API.broadcaster_name = channel
-        self.API._test_connection()
-        await self.IRC._join(channel)
+        await self.API._test_connection()
+        await self.IRC._move(channel)
 
 
 
@@ -273,4 +375,20 @@ class Client:
 
 
     def get_IRC(self) -> IRC:
-        return self.IRC
\ No newline at end of file
+        return self.IRC
+
+
+
+    def get_command_stats(self) -> dict:
+        """
+        how many commands are running ('in_flight'), waiting to run ('queued'), finished ('completed'), and raised an exception ('failed')
+        """
+        return self.executor.get_stats()
+
+
+
+    def get_worker_stats(self) -> dict:
+        """
+        the latest stats from every worker process by worker number, or an empty dict if the bot isn't using workers. See Workers.Supervisor.get_stats()
+        """
+        return self.supervisor.get_stats() if self.supervisor else dict()
\ No newline at end of file
@@ -1,10 +1,19 @@
+# bits for User.roles
+# every viewer has ROLE_EVERYONE, so a command that everyone can use matches any user
+ROLE_BROADCASTER = 1
+ROLE_MODERATOR = 2
+ROLE_SUBSCRIBER = 4
+ROLE_EVERYONE = 8
+
+
+
 class User:
     """More or less just a container to hold information on the viewer who sent a message.
 
     Parameters
     -----------
     name : str
-        The username of the viewer.
+        The username (login name) of the viewer. This is always lowercase.
 
     uid : str
         The user ID of the viewer.
@@ -25,17 +34,36 @@ class User:
     badges : [str]
         A list of all the chat badges the viewer has.
 
+    display_name : str (optional)
+        The name of the viewer as it shows up in chat, which might have different capitalization or characters than name.
+        If not given, will default to name.
+
 
     Attributes
     ------------
     See Parameters
 
+    roles : int
+        broadcaster, moderator, and subscriber as bits (UserInfo.ROLE_BROADCASTER, ROLE_MODERATOR, and ROLE_SUBSCRIBER),
+        plus UserInfo.ROLE_EVERYONE which every viewer has. Used to check command permissions with a single &.
+
 
     Note
     ------------
     Does not keep track of follower status because that requries an API call.
+
+    Note
+    ------------
+    Users made from chat messages only know their name at first. Everything else is decoded from the
+    message's tags the first time you access it.
+
+    Note
+    ------------
+    User uses __slots__, so you can't add your own attributes to it.
     """
-    def __init__(self, name: str, uid: str, broadcaster: bool, moderator: bool, subscriber: bool, sub_length: int, badges: [str]):
+    __slots__ = ('name', 'id', 'broadcaster', 'moderator', 'subscriber', 'sub_length', 'badges', 'display_name', 'roles', '_message')
+
+    def __init__(self, name: str, uid: str, broadcaster: bool, moderator: bool, subscriber: bool, sub_length: int, badges: [str], display_name: str=None):
         # variables given
         self.name = name
         self.id = uid
@@ -44,30 +72,96 @@ class User:
         self.subscriber = subscriber
         self.sub_length = sub_length
         self.badges = badges
+        self.display_name = display_name or name
+
+        # variables created
+        self.roles = self._get_roles()
+        self._message = None    # the Parser.Message this user's info is decoded from, if it hasn't been yet
+
+
+
+    @classmethod
+    def _from_message(cls, message, name: str=None):
+        """
+        makes a user from a Parser.Message of a PRIVMSG (or USERNOTICE) line without decoding any tags
+        the login name comes from the line's prefix unless it's given, everything else is filled in by __getattr__ when it's needed
+        """
+        user = cls.__new__(cls)
+        user.name = name or message.nick or message.tags.get('display-name', '').lower()
+        user._message = message
+        return user
+
+
+
+    def __getattr__(self, name: str):
+        """
+        only called if a slot hasn't been filled yet, which means it hasn't been decoded from the tags yet
+        """
+        if name.startswith('_') or name not in User.__slots__ or self._message is None:
+            raise AttributeError(f"'User' object has no attribute '{name}'")
+        self._decode_tags()
+        return object.__getattribute__(self, name)
+
+
+
+    def _decode_tags(self):
+        """
+        fills in everything besides the name from the message's tags
+        https://dev.twitch.tv/docs/irc/tags#privmsg-twitch-tags
+        """
+        tags = self._message.tags
+        self._message = None
+
+        badges = tags.get('badges', '')
+        self.badges = badges.split(',') if badges else []
+        self.id = tags.get('user-id', '')
+        self.display_name = tags.get('display-name') or self.name
+        self.broadcaster = any(badge.startswith('broadcaster/') for badge in self.badges)
+        self.moderator = tags.get('mod') == '1'
+        self.subscriber = tags.get('subscriber') == '1'
+
+        self.sub_length = 0
+        for info in tags.get('badge-info', '').split(','):  # ex: 'subscriber/17' or 'founder/20'
+            badge, _, months = info.partition('/')
+            if badge in ['subscriber', 'founder'] and months.isdigit():
+                self.sub_length = int(months)
+
+        self.roles = self._get_roles()
+
+
+
+    def _get_roles(self) -> int:
+        """
+        puts broadcaster, moderator, and subscriber together into bits
+        """
+        return (ROLE_EVERYONE
+                | (ROLE_BROADCASTER if self.broadcaster else 0)
+                | (ROLE_MODERATOR if self.moderator else 0)
+                | (ROLE_SUBSCRIBER if self.subscriber else 0))
 
 
 
 
 
-        ###################### GETTER FUNCTIONS ######################
+    ###################### GETTER FUNCTIONS ######################
 
-        def get_name(self) -> str:
-            return self.name
+    def get_name(self) -> str:
+        return self.name
 
-        def get_id(self) -> str:
-            return self.name
+    def get_id(self) -> str:
+        return self.id
 
-        def is_broadcaster(self) -> bool:
-            return self.broadcaster
+    def is_broadcaster(self) -> bool:
+        return self.broadcaster
 
-        def is_mod(self) -> bool:
-            return self.moderator
+    def is_mod(self) -> bool:
+        return self.moderator
 
-        def is_sub(self) -> bool:
-            return self.subscriber
+    def is_sub(self) -> bool:
+        return self.subscriber
 
-        def get_sub_length(self) -> int:
-            return self.sub_length
+    def get_sub_length(self) -> int:
+        return self.sub_length
 
-        def get_badges(self) -> [str]:
-            return self.badges
\ No newline at end of file
+    def get_badges(self) -> [str]:
+        return self.badges
\ No newline at end of file
@@ -1,11 +1,15 @@
 # python standard modules
 import asyncio
 from copy import deepcopy
+import random
 import sys
+import time
 
 # TwitchPy modules
-from .ChatInfo import Chat
+from .ChatInfo import Channel, Chat, ChatHistory, ClearChat, ClearMsg, Membership, RoomState, UserNotice
 from .errors import *
+from .Parser import parse, parse_command
+from .RateLimit import PRIORITIES, SendQueue
 from .UserInfo import User
 from .utilities import *
 
@@ -15,6 +19,7 @@ class IRC:
     """Handles the IRC connection to twitch chat.
 
     Is responsible for reading and sending messages and selecting which commands to execute.
+    Every channel the bot is in shares the same connection.
 
     Reference: https://dev.twitch.tv/docs/irc/guide
 
@@ -24,8 +29,8 @@ class IRC:
     logger : Logger.Logger
         The bot's custom logger.
 
-    commands : (Commands.Cog)
-        A set of all the command cogs.
+    router : Commands.Router
+        Decides which cog's command (if any) to execute for each chat message.
 
     events : Event.Handler
         The event handler.
@@ -37,22 +42,65 @@ class IRC:
         The bot's username.
 
     channel : str
-        The channel to connect to.
+        The main channel to connect to. This is where IRC.send() sends messages unless it's told otherwise.
 
     chatlimit : int
-        The maximum number of chat messages that chat_history attribute should hold on to.
-        If chat_history becomes full (number of messages equals or exceeds chatlimit),
-        delete messages to make space for newer ones.
+        The maximum number of chat messages that each channel's chat history should hold on to.
+        If a chat history becomes full (number of messages equals or exceeds chatlimit),
+        delete messages to make space for newer ones. None means no limit and 0 means don't save any.
+
+    channels : [str] (optional)
+        Other channels to join besides channel.
 
 
     Attributes
     --------------
     See parameters
 
-    chat_history : [TwitchPy.ChatInfo.Chat]
-        A list of all messages sent through twitch IRC during the bot's runtime.
+    channels : {str: TwitchPy.ChatInfo.Channel}
+        Every channel the bot is in or is waiting to join, by name. Each one has its own chat history and chat settings.
+
+    chat_history : TwitchPy.ChatInfo.ChatHistory
+        All messages sent in the main channel during the bot's runtime, which works like a read-only list.
         Newest messages will be at the front (position 0) while older messages will be at the back.
-        Note: Chats will only be inserted into the list after any command invocation (if any).
+        Note: Chats will only be inserted into the history after any command invocation (if any).
+        Same as channels[channel].chat_history
+
+    outgoing : TwitchPy.RateLimit.SendQueue
+        Chat messages waiting to be sent. Twitch only allows 20 messages every 30 seconds, or 100 if the bot
+        is a moderator or broadcaster of the channel, so messages wait here until they can be sent.
+        Twitch counts messages across every channel, so the bot only gets the higher limit if it's a moderator
+        or broadcaster of every channel it's in.
+
+    joins : TwitchPy.RateLimit.SendQueue
+        Channels waiting to be joined. Twitch only allows 20 JOINs every 10 seconds, so channels wait here until
+        they can be joined. Bots that twitch allows to join more can raise joins.limit .
+
+    moderator : bool
+        True if twitch says the bot is a moderator or broadcaster of every channel it's in. When this is one
+        shard of a Sharding.ShardPool, that means every channel on every shard.
+
+    high_water : int
+        How many bytes can be waiting to be written to the connection before anything sending to IRC has to
+        wait for them to be written. Defaults to 64 KiB.
+
+    read_budget : float
+        The most seconds the listener spends handling lines before letting other tasks (like commands) run.
+        Defaults to 0.005.
+
+    reconnect_delay : float
+        The most seconds to wait before the first attempt to reconnect after the connection drops.
+        Doubles after every failed attempt. Defaults to 1.
+
+    max_reconnect_delay : float
+        The most seconds to wait between attempts to reconnect, no matter how many have failed. Defaults to 60.
+
+    reconnects : int
+        How many times the bot has reconnected to twitch.
+
+    lag : float
+        How many seconds behind chat the bot is, going by when twitch says the newest chat message the bot has
+        handled was sent. Any difference between twitch's clock and yours is included. 0.0 until a message arrives.
 
     reader : asyncio.StreamReader
         The object that's responsible for reading from twitch chat.
@@ -64,21 +112,51 @@ class IRC:
 
         See https://docs.python.org/3/library/asyncio-stream.html#streamwriter
     """
-    def __init__(self, logger, commands, events, token: str, user: str, channel: str, chatlimit: int):
+    def __init__(self, logger, router, events, token: str, user: str, channel: str, chatlimit: int, channels: [str]=None):
         # log
         self.logger = logger
         asyncio.run(self.logger.log(11, 'init', 'initializing IRC...'))
 
         # variables given
-        self.commands = commands    # command handler
+        self.router = router        # command handler
         self.events = events        # event handler
         self.token = token          # oauth token
         self.user = user            # bot's username
-        self.channel = channel      # channel to connect to
+        self.channel = channel.lower()  # main channel, twitch always sends channel names in lowercase
         self.chatlimit = chatlimit
 
         # variables created
-        self.chat_history = []
+        self.channels = {self.channel: Channel(self.channel, chatlimit)}
+        for name in channels or []:
+            self.channels.setdefault(name.lower(), Channel(name.lower(), chatlimit))
+        self.outgoing = SendQueue(limit=20, per=30)
+        self.joins = SendQueue(limit=20, per=10)
+        self.moderator = False
+        self._peers = [self]    # every IRC sending with the same account, which all share the same limits (see Sharding.ShardPool)
+        self._sender = None     # the task sending what's in self.outgoing, while there's anything to send
+        self._joiner = None     # the task joining what's in self.joins, while there's anything to join
+        self.high_water = 64 * 1024
+        self._pending = []      # encoded lines that haven't been handed to self.writer yet
+        self._pending_bytes = 0
+        self._flush_handle = None   # the scheduled self._flush() call, if there is one
+        self.read_budget = 0.005
+        self.reconnect_delay = 1
+        self.max_reconnect_delay = 60
+        self.reconnects = 0
+        self.lag = 0.0
+        self._newest = None     # the newest chat message since self.lag was last updated
+        self._handlers = {      # {IRC command: what to do with it}, anything not in here is ignored without being parsed
+            'PING': self._on_ping,
+            'PRIVMSG': self._on_privmsg,
+            'USERSTATE': self._on_userstate,
+            'USERNOTICE': self._on_usernotice,
+            'CLEARCHAT': self._on_clearchat,
+            'CLEARMSG': self._on_clearmsg,
+            'ROOMSTATE': self._on_roomstate,
+            'JOIN': self._on_membership,
+            'PART': self._on_membership,
+            'RECONNECT': self._on_reconnect,
+        }
         # these will be set during self.connect()
         self.reader = None
         self.writer = None
@@ -91,18 +169,32 @@ class IRC:
     async def connect(self):
         '''Connects to and sends twitch IRC all the info it needs to connect to chat with appropriate permissions
         '''
+        self.reader, self.writer = await self._open()
+        self._flush()   # anything sent before there was a connection
+        await self._join_all()
+
+
+
+    async def _open(self):
+        """
+        opens a new connection to twitch IRC and logs in without touching the current connection
+        the login lines are written straight to the new writer so they can't get mixed up with lines waiting to be sent on the current one
+        """
         await self.logger.log(11, 'init', f'sending credentials...')
-        self.reader, self.writer = await asyncio.open_connection('irc.chat.twitch.tv', 6667)
-        await self.basic_send('CAP REQ :twitch.tv/tags twitch.tv/commands twitch.tv/membership')
-        await self.basic_send(f'PASS {self.token}')
-        await self.basic_send(f'NICK {self.user}')
+        reader, writer = await asyncio.open_connection('irc.chat.twitch.tv', 6667)
+        writer.transport.set_write_buffer_limits(high=self.high_water)     # makes writer.drain() wait once there's this much to write
+        for msg in ['CAP REQ :twitch.tv/tags twitch.tv/commands twitch.tv/membership', f'PASS {self.token}', f'NICK {self.user}']:
+            await self.logger.log(9, 'send', f'SEND: "{msg}"')
+            writer.write(f'{msg}\r\n'.encode())
+        await writer.drain()
 
         # raise exceptions if we did not successfully connect
         # also, apparently NICK doesn't matter, we can change it to whatever and twitch will accept it
-        response = (await self.reader.readline()).decode() # we have to 'burn' a readline due to the response from CAP REQ
-        response = (await self.reader.readline()).decode()
+        response = (await reader.readline()).decode() # we have to 'burn' a readline due to the response from CAP REQ
+        response = (await reader.readline()).decode()
 
         if 'NOTICE' in response:
+            writer.close()
             await self.logger.log(40, 'error', response)
             if 'Improperly formatted auth' in response:
                 # full twitch response ":tmi.twitch.tv NOTICE * :Improperly formatted auth"
@@ -114,31 +206,201 @@ class IRC:
                 raise InvalidAuth
 
         await self.logger.log(11, 'init', f'credentials accepted')
-        await self._join(self.channel)
+        return reader, writer
+
+
+
+    async def _reconnect(self):
+        """
+        opens a new connection, moves everything over to it, then closes the old one
+        so if the old connection still works (twitch sent RECONNECT), there's no gap where the bot isn't in chat
+        lines that couldn't be written to the old connection and messages still in self.outgoing are sent on the new one
+        """
+        reader, writer = await asyncio.wait_for(self._open(), 30)
+        self._flush()   # the old connection gets whatever it still can, if it's still open
+        old_writer = self.writer
+        self.reader, self.writer = reader, writer
+        self._flush()   # and the new one gets the rest
+        await self._join_all()
+        if self.outgoing and self._sender is None:
+            self._sender = asyncio.create_task(self._send_loop())
+        old_writer.close()
+        self.reconnects += 1
+        await self.logger.log(20, 'basic', 'reconnected to twitch')
+
+
+
+    async def _reconnect_with_backoff(self):
+        """
+        keeps trying self._reconnect() until it works, waiting a random amount of time before every attempt
+        the most it can wait doubles after every failed attempt so we don't hammer twitch while it's down
+        and it's random so that lots of bots that dropped at the same time don't all come back at the same time
+        https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+        """
+        attempt = 0
+        while True:
+            delay = random.uniform(0, min(self.max_reconnect_delay, self.reconnect_delay * 2 ** min(attempt, 16)))
+            await self.logger.log(19, 'basic', f'reconnecting in {delay:.1f} seconds...')
+            await asyncio.sleep(delay)
+            try:
+                await self._reconnect()
+                return
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as err:
+                attempt += 1
+                await self.logger.log(30, 'error', f'failed to reconnect to twitch: {err!r}')
+
+
+
+    async def join(self, channel: str):
+        '''Joins another channel's chat on the same connection as every other channel.
+
+        Twitch only lets the bot join 20 channels every 10 seconds, so the channel waits in the joins attribute
+        until it can be joined, which means this returns right away. Does nothing if the bot is already in
+        (or waiting to join) the channel.
+
+        Parameters
+        -----------
+        channel : str
+            The channel to join.
+
+        Raises
+        ---------
+        TypeError
+            Raised if parameters are not the correct data type.
+        '''
+        # input sanitization
+        if (err_msg := check_param(channel, str)):
+            raise TypeError(f'TwitchPy.Websocket.IRC.join(): {err_msg}')
+
+        channel = channel.lower()
+        if channel in self.channels:
+            return
+        self.channels[channel] = Channel(channel, self.chatlimit)
+        if self.writer is not None:     # otherwise IRC.connect() joins it
+            self._queue_join(channel)
+        if self._update_limit():
+            await self.logger.log(19, 'basic', f'bot can now send {self.outgoing.limit} messages every {self.outgoing.per} seconds')
+
 
 
+    async def part(self, channel: str):
+        '''Leaves a channel's chat and forgets its chat history.
+
+        Parameters
+        -----------
+        channel : str
+            The channel to leave.
+
+        Raises
+        ---------
+        TypeError
+            Raised if parameters are not the correct data type.
 
-    async def _join(self, channel: str):
+        ValueError
+            Raised if channel is the main channel. Use TwitchPy.TwitchBot.Client.change_channel() instead.
         '''
-        joins a twitch channel's chat
+        # input sanitization
+        if (err_msg := check_param(channel, str)):
+            raise TypeError(f'TwitchPy.Websocket.IRC.part(): {err_msg}')
+        channel = channel.lower()
+        if channel == self.channel:
+            raise ValueError(f"TwitchPy.Websocket.IRC.part(): can't leave the main channel '{channel}', use TwitchBot.Client.change_channel() instead")
+
+        if self.channels.pop(channel, None) is None:
+            return
+        await self.logger.log(19, 'basic', f'leaving channel: {channel}')
+        if self.writer is not None:
+            await self.basic_send(f'PART #{channel}')
+        self._update_limit()
+
+
+
+    async def _part_when_left(self, channel: str, timeout: float) -> bool:
+        """
+        leaves a channel, but keeps handling its messages until twitch says the bot has left so none are missed
+        returns False if twitch didn't say so within timeout seconds, in which case it's forgotten anyway
+        """
+        if (entry := self.channels.get(channel)) is None:
+            return True
+        await self.logger.log(19, 'basic', f'leaving channel: {channel}')
+        await self.basic_send(f'PART #{channel}')
+        deadline = time.monotonic() + timeout
+        while entry.joined and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self.channels.get(channel) is entry:
+            del self.channels[channel]
+        self._update_limit()
+        return not entry.joined
+
+
+
+    async def _move(self, channel: str):
+        '''
+        makes channel the main channel and leaves the old one
         note: the user should not be using this. the user should use TwitchBot.Client.change_channel() function
               because we also need to update information in API.Helix
         note: there's no good way to check if we successfully connection to the channel,
               but we check if channel is a valid channel name when we update API.Helix
-
-        arg     channel     (required)  the channel to connect to
         '''
-        await self.logger.log(19, 'basic', f'connecting to channel: {self.channel}...')
-        self.channel = channel
-        await self.basic_send(f'JOIN #{self.channel}')
-        await self.logger.log(19, 'basic', f'successfully connected to channel: {self.channel}')
+        old, self.channel = self.channel, channel.lower()
+        await self.join(self.channel)
+        if old != self.channel:
+            await self.part(old)
+
+
+
+    async def _join_all(self):
+        """
+        joins every channel in self.channels (main channel first), which has to be done every time we connect
+        """
+        self.joins.clear()
+        for name in sorted(self.channels, key=lambda name: name != self.channel):
+            self.channels[name].joined = False
+            self._queue_join(name)
         await self.events.on_connect()
 
 
 
+    def _queue_join(self, channel: str):
+        """
+        puts a channel in self.joins and makes sure something is joining them
+        """
+        self.joins.put(channel)
+        if self._joiner is None:
+            self._joiner = asyncio.create_task(self._join_loop())
+
+
+
+    async def _join_loop(self):
+        """
+        joins everything in self.joins as fast as twitch's join rate limit allows, then stops
+        https://dev.twitch.tv/docs/irc/guide#rate-limits
+        """
+        try:
+            while self.joins:
+                if self.writer.is_closing():    # the connection dropped, IRC._reconnect() starts this again
+                    break
+                if (delay := self.joins.wait_time()):
+                    await self.logger.log(9, 'send', f'join rate limited, waiting {delay:.2f} seconds to join more channels')
+                    await asyncio.sleep(delay)
+                    continue
+                channel = self.joins.pop()
+                if channel in self.channels:    # might have been left while it was waiting
+                    await self.logger.log(19, 'basic', f'joining channel: {channel}...')
+                    await self.basic_send(f'JOIN #{channel}')
+        except ConnectionError:
+            await self.logger.log(30, 'error', 'lost connection to twitch while joining channels')
+        finally:
+            self._joiner = None
+
+
+
     async def basic_send(self, msg: str):
         '''Sends a message to the twitch IRC at it's most basic level.
 
+        Lines sent in the same event loop iteration are written to the connection together in one write.
+        If more than high_water bytes are waiting to be written, this waits until the connection catches up.
+
         Note
         --------
         This isn't for sending messages to twitch chat. For that use Websocket.IRC.send()
@@ -159,43 +421,168 @@ class IRC:
             raise TypeError(f'TwitchPy.Websocket.IRC.basic_send(): {err_msg}')
 
         await self.logger.log(9, 'send', f'SEND: "{msg}"')
-        self.writer.write(f'{msg}\r\n'.encode())
-        await self.writer.drain()
+        line = f'{msg}\r\n'.encode()
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_event_loop().call_soon(self._flush)
+
+        if self.get_buffered_bytes() > self.high_water and self.writer is not None:
+            self._flush()
+            await self.writer.drain()
+
 
 
+    def _flush(self):
+        """
+        hands every pending line to the writer in one write
+        scheduled by basic_send() to run once the current event loop iteration is done
+        if there's no open connection, the lines are kept until there is one (see IRC.connect() and IRC._reconnect())
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending and self.writer is not None and not self.writer.is_closing():
+            self.writer.write(b''.join(self._pending))
+            self._pending.clear()
+            self._pending_bytes = 0
 
-    async def send(self, msg: str):
+
+
+    async def send(self, msg: str, priority: str='normal', channel: str=None):
         '''Sends a message to twitch chat.
 
+        The message is queued and sent as soon as twitch's rate limit allows, so this returns right away.
+        See the outgoing attribute.
+
         Parameters
         -----------
         msg : str
             The message that you want to show up in twitch chat.
 
+        priority : {'high', 'normal', 'low'} (optional)
+            If messages are waiting to be sent, higher priority messages are sent first. Defaults to 'normal'.
+
+        channel : str (optional)
+            The channel to send the message to. Defaults to the main channel.
+            To reply to a chat message, use its channel attribute.
+
         Raises
         ---------
         TypeError
             Raised if parameters are not the correct data type.
+
+        ValueError
+            Raised if priority is not the correct value.
         '''
         # input sanitization
         if (err_msg := check_param(msg, str)):
             raise TypeError(f'TwitchPy.Websocket.IRC.send(): {err_msg}')
+        if priority not in PRIORITIES:
+            raise ValueError(f"TwitchPy.Websocket.IRC.send(): priority expects 'high', 'normal', or 'low' not '{priority}'")
+        if channel is not None and (err_msg := check_param(channel, str)):
+            raise TypeError(f'TwitchPy.Websocket.IRC.send(): {err_msg}')
+
+        channel = channel.lower() if channel is not None else self.channel
+        if self.logger.is_enabled_for(21):  # the Chat is only for logging, so don't make one if nothing will see it
+            chat = Chat(channel)
+            chat.msg = msg
+            chat.user = User(self.user, '', False, False, False, False, [])
+            await self.logger.log(21, 'outgoing', chat)
+        self.outgoing.put(f'PRIVMSG #{channel} :{msg}', priority)
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._send_loop())
+
+
+
+    async def _send_loop(self):
+        """
+        sends everything in self.outgoing as fast as the rate limit allows, then stops
+        IRC.send() starts this again the next time there's something to send
+        """
+        try:
+            while self.outgoing:
+                if self.writer.is_closing():    # the connection dropped, IRC._reconnect() starts this again
+                    break
+                if (delay := self.outgoing.wait_time()):
+                    await self.logger.log(9, 'send', f'rate limited, waiting {delay:.2f} seconds to send')
+                    await asyncio.sleep(delay)
+                    continue
+                await self.basic_send(self.outgoing.pop())
+        except ConnectionError:
+            await self.logger.log(30, 'error', 'lost connection to twitch while sending messages')
+        finally:
+            self._sender = None
+
+
+
+    def _set_moderator(self, message):
+        """
+        twitch sends a USERSTATE with the bot's badges after it joins a channel and after every message it sends
+        returns True if that changed how many messages the bot can send
+        """
+        if (channel := self.channels.get(message.channel)) is not None:
+            channel.moderator = message.get_tag('mod') == '1' or 'broadcaster/' in message.get_tag('badges', '')
+        return self._update_limit()
+
 
-        chat = Chat(self.channel)
-        chat.msg = msg
-        chat.user = User(self.user, '', False, False, False, False, [])
-        await self.logger.log(21, 'outgoing', chat)
-        await self.logger.log(9, 'send', f'SEND: "PRIVMSG #{self.channel} :{msg}"')
-        self.writer.write(f'PRIVMSG #{self.channel} :{msg}\r\n'.encode())
+
+    def _update_limit(self):
+        """
+        moderators and broadcasters are allowed to send 100 messages every 30 seconds instead of 20
+        twitch counts messages across every channel, so we only use the higher limit if the bot is a moderator everywhere
+        (including every channel on every other connection in self._peers, since they share the same limit)
+        returns True if the limit changed
+        """
+        moderator = all(channel.moderator for irc in self._peers for channel in irc.channels.values())
+        if moderator != self.moderator:
+            for irc in self._peers:
+                irc.moderator = moderator
+                irc.outgoing.limit = 100 if moderator else 20
+            return True
+        return False
 
 
 
     async def disconnect(self):
         '''Closes all connections to twitch IRC.
+
+        Waits up to 5 seconds for any queued messages to be sent first.
         '''
-        await self.logger.log(19, 'basic', f'disconnecting from {self.channel}')
+        await self.logger.log(19, 'basic', 'disconnecting from twitch')
+        if self._joiner is not None:
+            self._joiner.cancel()
+        if self._sender is not None:
+            try:
+                await asyncio.wait_for(self._sender, 5)
+            except (asyncio.TimeoutError, ConnectionError):
+                await self.logger.log(30, 'error', f'{len(self.outgoing)} queued messages were not sent')
+        self._flush()
         self.writer.close()
-        await self.writer.wait_closed()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+
+    async def run(self):
+        '''Listens to twitch chat until the bot stops, reconnecting whenever the connection drops.
+
+        Waits a random amount of time before every attempt to reconnect: up to reconnect_delay seconds at first,
+        then twice as long after every attempt that fails, but never more than max_reconnect_delay seconds.
+        Once reconnected, the bot joins the channel again and sends any messages that were waiting to be sent.
+        '''
+        try:
+            while True:
+                try:
+                    await self.listen()
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as err:   # asyncio.TimeoutError isn't an OSError before 3.11
+                    await self.logger.log(30, 'error', f'lost connection to twitch: {err!r}')
+                    self.writer.close()
+                    await self._reconnect_with_backoff()
+        finally:
+            await self.disconnect()
 
 
 
@@ -203,32 +590,186 @@ class IRC:
         '''An infinite loop that listens to twitch chat.
 
         Also responsible for parsing chat messages and deciding which commands to execute (if any).
+        If the connection is replaced (see IRC.run()), this carries on reading from the new one.
+
+        Raises
+        ---------
+        ConnectionResetError
+            Raised if twitch closes the connection.
         '''
         await self.logger.log(20, 'basic', 'bot is now listening...')
+        reader = None
+        partial = b''   # the start of a line that hasn't been completely received yet
+        deadline = time.monotonic() + self.read_budget
+        while True:
+            if reader is not self.reader:   # moved to a new connection, so the rest of a line from the old one will never come
+                reader, partial = self.reader, b''
+
+            # read whatever has arrived (up to 64 KiB) and handle every complete line in it at once
+            # note: read() doesn't let other tasks run if data is already waiting, so the deadline carries over between chunks,
+            # but if it had to wait then other tasks got their turn and the lines that arrived get a whole budget of their own
+            # (StreamReader doesn't have a public way to ask if anything is waiting)
+            waited = not reader._buffer
+            chunk = await reader.read(65536)
+            if not chunk:
+                raise ConnectionResetError('twitch closed the connection')
+            if waited:
+                deadline = time.monotonic() + self.read_budget
+            lines, _, partial = (partial + chunk).rpartition(b'\r\n')
+            if not lines:
+                continue
+
+            for line in lines.decode(errors='replace').split('\r\n'):
+                await self._handle_line(line)
+                if time.monotonic() > deadline:    # let other tasks run if there's a lot to get through
+                    await asyncio.sleep(0)
+                    deadline = time.monotonic() + self.read_budget
+
+            if self._newest is not None:    # only once per read so it's cheap no matter how busy chat is
+                self._update_lag()
+
+
+
+    def _update_lag(self):
+        """
+        works out self.lag from the tmi-sent-ts tag (milliseconds since the epoch) of the newest chat message
+        """
+        sent = self._newest.get_tag('tmi-sent-ts', '')
+        self._newest = None
+        if sent.isdigit():
+            self.lag = max(0.0, time.time() - int(sent) / 1000)
+
+
+
+    async def _handle_line(self, line: str):
+        """
+        does whatever needs to be done with a single line received from twitch
+        only the command is looked at until we know there's something to do with the line
+        https://dev.twitch.tv/docs/irc/commands
+        """
+        await self.logger.log(9, 'recv', line)
+        if (handler := self._handlers.get(parse_command(line))):
+            await handler(parse(line))
+
+
+
+    async def _on_ping(self, message):
+        """
+        tells twitch that we want our connection to stay alive
+        twitch will occasionally send 'PING :tmi.twitch.tv' and expects 'PONG :tmi.twitch.tv' back to keep the connection alive
+        https://dev.twitch.tv/docs/irc/guide#connecting-to-twitch-irc
+        """
+        await self.basic_send(f'PONG :{message.trailing}')
+
+
+
+    async def _on_privmsg(self, message):
+        """
+        a PRIVMSG is a public message in twitch chat
+        lines for channels we've left (but twitch sent before it knew that) and paused channels are ignored,
+        and so are messages another shard already handled while the channel is moving between them
+        """
+        if (channel := self.channels.get(message.channel)) is None or channel.paused:
+            return
+        if channel._seen is not None and not channel._is_new(message.get_tag('id')):
+            return
+        channel.messages += 1
+        self._newest = message
+        chat = Chat(channel.name)
+        await chat._parse(message)
+        await self.logger.log(21, 'incoming', chat)
+        await self.events.on_msg(chat)
+
+        await self.router.dispatch(chat)
+
+        channel.chat_history.append(chat)
+
+
+
+    async def _on_userstate(self, message):
+        """
+        twitch tells us the bot's badges in the channel, which decides how fast we can send messages
+        """
+        if self._set_moderator(message):
+            await self.logger.log(19, 'basic', f'bot can now send {self.outgoing.limit} messages every {self.outgoing.per} seconds')
+
+
+
+    async def _on_usernotice(self, message):
+        await self.events.on_usernotice(UserNotice(message))
+
+
+
+    async def _on_clearchat(self, message):
+        await self.events.on_clearchat(ClearChat(message))
+
+
+
+    async def _on_clearmsg(self, message):
+        await self.events.on_clearmsg(ClearMsg(message))
+
+
+
+    async def _on_roomstate(self, message):
+        roomstate = RoomState(message)
+        if (channel := self.channels.get(roomstate.channel)) is not None:
+            channel._update_roomstate(RoomState(message))   # a copy, so the one given to the event handler is left alone
+        await self.events.on_roomstate(roomstate)
+
+
+
+    async def _on_membership(self, message):
+        """
+        JOIN and PART, which twitch also sends for the bot itself
+        """
+        membership = Membership(message)
+        if membership.username == self.user.lower() and (channel := self.channels.get(membership.channel)) is not None:
+            channel.joined = membership.joined
+            if membership.joined:
+                await self.logger.log(19, 'basic', f'successfully joined channel: {channel.name}')
+        if membership.joined:
+            await self.events.on_join(membership)
+        else:
+            await self.events.on_part(membership)
+
+
+
+    async def _on_reconnect(self, message):
+        """
+        twitch is about to close the connection for maintenance
+        the new connection is opened before the old one is closed so we don't miss anything in between
+        """
+        await self.logger.log(19, 'basic', 'twitch asked the bot to reconnect')
+        await self.events.on_reconnect()
         try:
-            while True:
-                await asyncio.sleep(0)  # this allows tasks to run concurrently
-                msg = (await self.reader.readline()).decode()
-                await self.logger.log(9, 'recv', msg)
-
-                # tells twitch that we want our connection to stay alive
-                # twitch will occasionally send 'PING :tmi.twitch.tv' and expects 'PONG :tmi.twitch.tv' back to keep the connection alive
-                # https://dev.twitch.tv/docs/irc/guide#connecting-to-twitch-irc
-                if msg.startswith('PING'):
-                    await self.basic_send('PONG :tmi.twitch.tv')
-
-                # if a message has PRIVMSG in it, it's a public message in twitch chat
-                elif 'PRIVMSG' in msg:
-                    chat = Chat(self.channel)
-                    await chat._parse(msg)
-                    await self.logger.log(21, 'incoming', chat)
-                    await self.events.on_msg(chat)
-
-                    for cog in self.commands:
-                            await cog._choose_command(chat)
-
-                    if self.chatlimit != None and len(self.chat_history) >= self.chatlimit:
-                        del self.chat_history[self.chatlimit-1:]
-                    self.chat_history.insert(0, chat)
-        finally:
-            await self.disconnect()
\ No newline at end of file
+            await self._reconnect()
+        except (OSError, asyncio.TimeoutError) as err:
+            # keep using the old connection, IRC.run() reconnects once twitch closes it
+            await self.logger.log(30, 'error', f'failed to open a new connection to twitch: {err!r}')
+
+
+
+
+
+    @property
+    def chat_history(self) -> ChatHistory:
+        return self.channels[self.channel].chat_history
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_buffered_bytes(self) -> int:
+        """
+        how many bytes are waiting to be written to the connection, both not yet handed to the writer and in the writer's buffer
+        """
+        if self.writer is None:
+            return self._pending_bytes
+        return self._pending_bytes + self.writer.transport.get_write_buffer_size()
+
+
+
+    def get_channels(self) -> [str]:
+        return list(self.channels)
\ No newline at end of file
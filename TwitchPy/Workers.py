@@ -0,0 +1,313 @@
+# python standard modules
+import asyncio
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import sys
+import threading
+import time
+
+# TwitchPy modules
+from .errors import *
+from .RateLimit import SharedWindow
+from .Sharding import ShardPool
+
+
+
+"""
+runs a bot across several processes so it can use more than one CPU core
+each worker process is a fork of the bot with its own channels and its own connection to twitch
+"""
+
+
+
+__all__ = ['Supervisor']
+
+
+
+class _Pipe:
+    """
+    a worker's end of its pipe to the supervisor, with put() like a queue so the logger can use it
+    """
+    def __init__(self, connection):
+        self.connection = connection
+        self._lock = threading.Lock()   # things logged from other threads (like run_in_executor()) can't be sent in the middle of each other
+
+
+
+    def put(self, item):
+        with self._lock:
+            self.connection.send(item)
+
+
+
+
+
+
+class Supervisor:
+    """Runs a bot in several worker processes and restarts any that crash.
+
+    The bot's channels are split between the workers. Each worker is a fork of the bot made when it starts
+    running, so every worker has the same cogs, event handler, and settings, but its own connection to twitch
+    (or its own Sharding.ShardPool) for just its channels. Functions given to TwitchBot.Client.run() only
+    run in worker 0, which has the main channel.
+
+    Twitch's rate limits are for the whole account, so every worker counts the messages and JOINs sent by the
+    others, and the higher message limit for moderators is only used once every worker is a moderator in all
+    of its channels.
+
+    Everything the workers log is sent back here and logged by the bot's logger, so log files are only ever
+    written by one process. Each worker also sends back its stats every stats_interval seconds.
+
+    If a worker crashes, it's started again after a delay that doubles every time it crashes soon after
+    starting, up to max_restart_delay seconds. If a worker stops on purpose (TwitchBot.Client.kill()), the
+    other workers are stopped too.
+
+    Use TwitchBot.Client's workers keyword argument instead of making one of these yourself.
+
+
+    Parameters
+    ------------
+    client : TwitchBot.Client
+        The bot to run.
+
+    workers : int
+        How many worker processes to run. Never more than the number of channels.
+
+
+    Attributes
+    ------------
+    groups : [[str]]
+        The channels each worker is in, main channel first.
+
+    processes : {int: multiprocessing.Process}
+        Every worker process that's been started, by worker number.
+
+    stats : {int: dict}
+        The latest stats from every worker, by worker number. See Supervisor.get_stats()
+
+    restarts : {int: int}
+        How many times each worker has been restarted, by worker number.
+
+    restart_delay : float
+        The most seconds to wait before restarting a worker the first time it crashes. Defaults to 1.
+
+    max_restart_delay : float
+        The most seconds to wait before restarting a worker, no matter how many times it's crashed. Defaults to 60.
+
+    stats_interval : float
+        How many seconds between each worker sending its stats. Defaults to 5.
+
+
+    Note
+    ------------
+    Workers are made with os.fork(), so this only works on platforms that have it (not Windows).
+    """
+    def __init__(self, client, workers: int):
+        # variables given
+        self.client = client
+
+        # variables created
+        names = [client.IRC.channel] + [name for name in client.IRC.channels if name != client.IRC.channel]
+        count = min(workers, len(names))
+        self.groups = [names[i::count] for i in range(count)]
+        self.processes = dict()
+        self.stats = dict()
+        self.restarts = {index: 0 for index in range(count)}
+        self.restart_delay = 1
+        self.max_restart_delay = 60
+        self.stats_interval = 5
+        self._context = multiprocessing.get_context('fork')
+        self._pipes = []    # the ends of the workers' pipes that ('log', logger name, record) and ('stats', worker number, dict) come out of
+        self._sends = SharedWindow(count, context=self._context)   # every worker's outgoing and joins share these
+        self._joins = SharedWindow(count, context=self._context)
+        self._started = dict()  # {worker number: when it was last started}
+        self._crashes = dict()  # {worker number: how many times in a row it's crashed soon after starting}
+
+
+
+    def run(self, funcs: list):
+        """Starts every worker and watches over them until the bot is killed.
+
+
+        Parameters
+        ------------
+        funcs : [func]
+            The async functions to run alongside the bot in worker 0. See TwitchBot.Client.run()
+        """
+        logger = self.client.logger
+        # this process forks a new worker whenever one crashes, which is only safe if it doesn't have any other threads
+        # that could be holding a lock at the time, so queued loggers' background threads are stopped and
+        # everything the workers send back is handled here instead of by a thread of its own
+        logger.shutdown()
+        asyncio.run(logger.log(20, 'basic', f'starting bot with {len(self.groups)} workers...'))
+
+        restart_at = dict()     # {worker number: when to restart it}
+        try:
+            for index in range(len(self.groups)):
+                self._start(index, funcs)
+
+            while True:
+                self._gather(0.5)
+                now = time.monotonic()
+                for index, process in self.processes.items():
+                    if process.is_alive() or index in restart_at:
+                        continue
+                    if process.exitcode == 0:   # the bot was killed on purpose
+                        asyncio.run(logger.log(20, 'basic', f'worker {index} stopped, stopping the other workers...'))
+                        return
+                    restart_at[index] = now + self._restart_wait(index)
+                    asyncio.run(logger.log(30, 'error', f'worker {index} crashed (exit code {process.exitcode}), restarting it in {restart_at[index] - now:.1f} seconds'))
+
+                for index, when in list(restart_at.items()):
+                    if now >= when:
+                        del restart_at[index]
+                        self.restarts[index] += 1
+                        self._start(index, funcs)
+        except KeyboardInterrupt:
+            asyncio.run(logger.log(20, 'basic', 'stopping workers...'))
+        finally:
+            self._stop_all()
+            self._gather(0)
+            asyncio.run(logger.log(20, 'basic', 'bot is shutting down...'))
+            logger.shutdown()
+
+
+
+    def _start(self, index: int, funcs: list):
+        """
+        forks a new worker process
+        """
+        # every worker gets its own pipe instead of sharing a multiprocessing.Queue, since the writers of a queue share
+        # a lock and a worker that crashed while holding it would leave the others unable to send anything back
+        reader, writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(target=self._work, args=(index, funcs, writer), name=f'TwitchPy-worker-{index}')
+        process.start()
+        writer.close()  # so the pipe ends once the worker does
+        self._pipes.append(reader)
+        self.processes[index] = process
+        self._started[index] = time.monotonic()
+        asyncio.run(self.client.logger.log(19, 'basic', f'started worker {index} (pid {process.pid}) for {len(self.groups[index])} channels'))
+
+
+
+    def _restart_wait(self, index: int) -> float:
+        """
+        how long to wait before restarting a worker that just crashed
+        crashing again right after starting doubles the wait, while running for a while first starts it over
+        """
+        if time.monotonic() - self._started[index] > self.max_restart_delay:
+            self._crashes[index] = 0
+        crashes = self._crashes.get(index, 0)
+        self._crashes[index] = crashes + 1
+        return min(self.max_restart_delay, self.restart_delay * 2 ** min(crashes, 16))
+
+
+
+    def _stop_all(self):
+        """
+        asks every worker that's still running to stop (SIGTERM), then kills any that haven't after 10 seconds
+        keeps reading what they send back in the meantime, so none of them get stuck waiting for room in their pipe
+        """
+        running = [process for process in self.processes.values() if process.is_alive()]
+        for process in running:
+            process.terminate()
+        deadline = time.monotonic() + 10
+        while any(process.is_alive() for process in running) and time.monotonic() < deadline:
+            self._gather(0.1)
+        for process in running:
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+
+
+    def _gather(self, timeout: float):
+        """
+        hands everything the workers have sent back to the bot's logger or to self.stats, waiting up to timeout seconds for something to arrive
+        stops after a while even if there's more, so a worker logging a lot doesn't keep crashed workers from being noticed
+        """
+        loggers = self.client.logger.loggers
+        for pipe in multiprocessing.connection.wait(self._pipes, timeout):
+            try:
+                for _ in range(10000):
+                    kind, key, value = pipe.recv()
+                    if kind == 'log':
+                        if (logger := loggers.get(key)) is not None:
+                            logger.handle(value)
+                    else:
+                        self.stats[key] = value
+                    if not pipe.poll():
+                        break
+            except (EOFError, OSError):    # the worker has exited and everything it sent has been read
+                pipe.close()
+                self._pipes.remove(pipe)
+
+
+
+    def _work(self, index: int, funcs: list, pipe):
+        """
+        runs in the worker process: makes the bot's connection for just this worker's channels and runs the bot
+        SIGTERM stops the bot the same way TwitchBot.Client.kill() does, and ctrl+c is left to the supervisor
+        """
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        client = self.client
+        pipe = _Pipe(pipe)
+        client.logger._send_to(pipe)
+        group = self.groups[index]
+        client.IRC = client._create_IRC(group[0], group[1:])
+        client.events._init_events(logger=client.logger, API=client.API, IRC=client.IRC)
+        self._sends.index = self._joins.index = index
+        for shard in client.IRC.shards if isinstance(client.IRC, ShardPool) else [client.IRC]:
+            shard.outgoing.share_limit_with(self._sends)
+            shard.joins.share_limit_with(self._joins)
+
+        async def report():
+            # SIGTERM is handled by the event loop (instead of signal.signal()) so it stops the bot between callbacks,
+            # the same way TwitchBot.Client.kill() does, instead of raising in the middle of whatever was running
+            stop = asyncio.Event()
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+            while not stop.is_set():
+                pipe.put(('stats', index, self._collect()))
+                try:
+                    await asyncio.wait_for(stop.wait(), self.stats_interval)
+                except asyncio.TimeoutError:
+                    pass
+            raise ExpectedExit
+
+        expected = client._run((funcs if index == 0 else []) + [report])
+        sys.exit(0 if expected else 1)
+
+
+
+    def _collect(self) -> dict:
+        """
+        the stats a worker sends back to the supervisor
+        """
+        client = self.client
+        shards = client.IRC.shards if isinstance(client.IRC, ShardPool) else [client.IRC]
+        return {
+            'pid': os.getpid(),
+            'channels': sum(len(shard.channels) for shard in shards),
+            'lag': max(shard.lag for shard in shards),
+            'sent': sum(shard.outgoing.sent for shard in shards),
+            'reconnects': sum(shard.reconnects for shard in shards),
+            'commands': client.get_command_stats(),
+            'time': time.time(),
+        }
+
+
+
+
+
+    ###################### GETTER FUNCTIONS ######################
+
+    def get_stats(self) -> {int: dict}:
+        """
+        the latest stats from every worker: its process id ('pid'), how many channels it's in, how many seconds behind chat it is ('lag'),
+        how many messages it's sent, how many times it's reconnected, its command stats (see TwitchBot.Client.get_command_stats()),
+        and when it sent them ('time', seconds since the epoch)
+        """
+        return dict(self.stats)
\ No newline at end of file
@@ -1,9 +1,15 @@
 from .API import *
+from .Cache import *
 from .ChatInfo import *
 from .Commands import *
 from .errors import *
 from .Events import *
+from .HTTP import *
 from .Logger import *
+from .Parser import *
+from .RateLimit import *
+from .Sharding import *
 from .TwitchBot import *
 from .UserInfo import *
-from .Websocket import *
\ No newline at end of file
+from .Websocket import *
+from .Workers import *
\ No newline at end of file
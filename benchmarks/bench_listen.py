@@ -0,0 +1,76 @@
+"""
+how many lines per second Websocket.IRC.listen() handles from a stream of chat replayed over a local connection,
+next to the old way of reading it (readline() and asyncio.sleep(0) for every line)
+run from the root of the repo with: python -m benchmarks.bench_listen [lines]
+"""
+import asyncio
+import io
+import sys
+import time
+
+from TwitchPy.Commands import Executor, Router
+from TwitchPy.Events import Handler
+from TwitchPy.Logger import Logger
+from TwitchPy.Websocket import IRC
+
+from .bench_parser import make_corpus
+
+
+
+async def listen_by_line(irc):
+    """
+    how listen() used to read: one line at a time, letting the event loop run before every one
+    """
+    while True:
+        await asyncio.sleep(0)
+        line = await irc.reader.readline()
+        if not line:
+            raise ConnectionResetError('twitch closed the connection')
+        await irc._handle_line(line.decode())
+
+
+
+async def replay(irc, data: bytes, listen) -> float:
+    """
+    sends data from a local server, then closes the connection, and times listen(irc) until it notices
+    returns seconds taken
+    """
+    async def send(reader, writer):
+        writer.write(data)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(send, '127.0.0.1', 0)
+    irc.reader, irc.writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+    start = time.perf_counter()
+    try:
+        await listen(irc)
+    except ConnectionResetError:
+        pass
+    taken = time.perf_counter() - start
+    irc.writer.close()
+    server.close()
+    await server.wait_closed()
+    return taken
+
+
+
+def main(count: int):
+    logger = Logger(preset='default')
+    logger.console.handlers[0].setStream(io.StringIO())     # every chat message is logged, but not to the terminal
+    events = Handler()
+    irc = IRC(logger, Router(logger, events, Executor()), events, 'oauth:token', 'bot', 'somechannel', None)
+    data = ''.join(f'{line}\r\n' for line in make_corpus(count)).encode()
+
+    results = [
+        ('readline() per line', asyncio.run(replay(irc, data, listen_by_line))),
+        ('IRC.listen()', asyncio.run(replay(irc, data, IRC.listen))),
+    ]
+    print(f'{count} lines, {len(data) // 1024} KiB')
+    for name, taken in results:
+        print(f'{name:<22} {count / taken:12,.0f} lines/sec')
+
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,61 @@
+"""
+how long a call to Logger.Logger.log() takes, and how long looking up its caller takes compared to inspect.stack()
+(which log() used to call every time)
+run from the root of the repo with: python -m benchmarks.bench_logger [calls]
+"""
+import asyncio
+import inspect
+import io
+import sys
+import time
+
+from TwitchPy.Logger import Logger, _find_caller
+
+
+
+def old_find_caller():
+    """
+    how log() used to find its caller
+    """
+    stack = inspect.stack()
+    return [frame for frame in stack if 'asyncio' not in frame.filename][1]
+
+
+
+def new_find_caller():
+    return _find_caller()
+
+
+
+async def time_calls(calls: int, func, *args) -> float:
+    """
+    microseconds per call of func(*args), awaited if it's a coroutine function
+    """
+    is_coro = inspect.iscoroutinefunction(func)
+    start = time.perf_counter()
+    for _ in range(calls):
+        if is_coro:
+            await func(*args)
+        else:
+            func(*args)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+
+async def main(calls: int):
+    logger = Logger(preset='default')   # the console logs level 19 and up
+    logger.console.handlers[0].setStream(io.StringIO())     # so writing to a terminal isn't what's being timed
+
+    results = [
+        ('caller lookup with inspect.stack()', await time_calls(max(calls // 50, 1), old_find_caller)),
+        ('caller lookup walking frames', await time_calls(calls, new_find_caller)),
+        ("log() at level 9 (nothing logs it)", await time_calls(calls, logger.log, 9, 'recv', 'PING :tmi.twitch.tv')),
+        ("log() at level 21 (the console logs it)", await time_calls(calls, logger.log, 21, 'incoming', 'someviewer: hello')),
+    ]
+    for name, us in results:
+        print(f'{name:<42} {us:10.2f} us/call')
+
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,85 @@
+"""
+how many lines per second Parser.parse() gets through, on a corpus of chat lines made to look like what twitch sends
+run from the root of the repo with: python -m benchmarks.bench_parser [lines]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from TwitchPy.ChatInfo import Chat
+from TwitchPy.Parser import parse, parse_command
+
+
+
+def make_corpus(count: int) -> [str]:
+    """
+    PRIVMSG lines with the same tags twitch sends, some with escaped tag values, emotes, and replies
+    seeded so every run gets the same lines
+    """
+    rand = random.Random(0)
+    words = ['hello', 'pog', 'lol', 'KEKW', 'gg', 'what', 'is', 'this', 'game', '!hello', 'nice', 'play', 'LUL', 'no', 'way', 'Kappa']
+    badges = ['', 'subscriber/12', 'moderator/1,subscriber/3', 'vip/1', 'broadcaster/1,premium/1']
+    lines = []
+    for i in range(count):
+        user = f'viewer{rand.randrange(5000)}'
+        text = ' '.join(rand.choice(words) for _ in range(rand.randint(1, 12)))
+        tags = [
+            f'badge-info={"subscriber/12" if "subscriber" in (badge := rand.choice(badges)) else ""}',
+            f'badges={badge}',
+            f'client-nonce={rand.getrandbits(128):032x}',
+            f'color=#{rand.getrandbits(24):06X}',
+            f'display-name={user.capitalize()}',
+            f'emotes={"25:0-4" if text.startswith("Kappa") else ""}',
+            'first-msg=0',
+            'flags=',
+            f'id={rand.getrandbits(128):032x}',
+            f'mod={int("moderator" in badge)}',
+            'room-id=12345',
+            f'subscriber={int("subscriber" in badge)}',
+            f'tmi-sent-ts={1700000000000 + i}',
+            'turbo=0',
+            f'user-id={rand.randrange(10**8)}',
+            'user-type=',
+        ]
+        if rand.random() < 0.1:     # replies have escaped spaces in their tags
+            tags.insert(0, 'reply-parent-msg-body=some\\sreply\\:\\stext')
+        lines.append(f'@{";".join(tags)} :{user}!{user}@{user}.tmi.twitch.tv PRIVMSG #somechannel :{text}')
+    return lines
+
+
+
+def rate(lines: [str], func) -> float:
+    """
+    lines per second of func(line)
+    """
+    start = time.perf_counter()
+    for line in lines:
+        func(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+
+def main(count: int):
+    lines = make_corpus(count)
+
+    async def to_chat():
+        start = time.perf_counter()
+        for line in lines:
+            await Chat('somechannel')._parse(parse(line))
+        return len(lines) / (time.perf_counter() - start)
+
+    results = [
+        ('parse_command()', rate(lines, parse_command)),
+        ('parse()', rate(lines, parse)),
+        ('parse() and every tag', rate(lines, lambda line: parse(line).tags)),
+        ('parse() into a ChatInfo.Chat', asyncio.run(to_chat())),
+    ]
+    print(f'{len(lines)} lines, {sum(map(len, lines)) // len(lines)} characters each on average')
+    for name, per_second in results:
+        print(f'{name:<30} {per_second:12,.0f} lines/sec')
+
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,198 @@
+"""
+tests for HTTP.HTTPClient against a stand-in HTTP server running on localhost
+run with: python -m unittest discover tests
+"""
+import asyncio
+import gzip
+import unittest
+
+from TwitchPy.HTTP import HTTPClient
+
+
+
+class FakeServer:
+    """
+    a tiny HTTP/1.1 server that keeps connections open and answers by path:
+        /chunked   the body in two chunks (Transfer-Encoding: chunked)
+        /gzip      a gzipped body
+        /slow      waits a second before answering
+        /once      answers, then closes the connection without saying it would (like a server's keep-alive timeout)
+        /cut       starts a chunked body, then closes the connection before it's finished
+        anything else   the path as the body
+    """
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+        self._handlers = dict()     # {task: writer}
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return f'http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}'
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            while (request := await reader.readuntil(b'\r\n\r\n')):
+                self.requests += 1
+                path = request.split(b' ')[1]
+                if path == b'/chunked':
+                    writer.write(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                                 b'5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n')
+                    continue
+                if path == b'/cut':
+                    writer.write(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n')
+                    await writer.drain()
+                    break
+                if path == b'/slow':
+                    await asyncio.sleep(1)
+                body = gzip.compress(b'squashed') if path == b'/gzip' else path
+                encoding = b'Content-Encoding: gzip\r\n' if path == b'/gzip' else b''
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n%s\r\n%s' % (len(body), encoding, body))
+                if path == b'/once':
+                    await writer.drain()
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self):
+        self.server.close()
+        for writer in self._handlers.values():     # so every handler stops reading and finishes
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+
+
+
+
+
+class TestHTTPClient(unittest.TestCase):
+    def run_with_server(self, test):
+        async def main():
+            server = FakeServer()
+            url = await server.start()
+            client = HTTPClient(timeout=0.5)
+            try:
+                await test(client, server, url)
+            finally:
+                await client.close()
+                await server.close()
+        asyncio.run(main())
+
+
+
+    def test_keep_alive(self):
+        async def test(client, server, url):
+            for i in range(5):
+                response = await client.request('GET', f'{url}/{i}?q=1')
+                self.assertEqual((response.status, response.body), (200, f'/{i}?q=1'.encode()))
+            self.assertEqual(server.connections, 1)
+            self.assertEqual(client.get_stats(), {'requests': 5, 'opened': 1, 'reused': 4, 'idle': 1})
+        self.run_with_server(test)
+
+
+
+    def test_concurrent_requests_share_the_pool(self):
+        async def test(client, server, url):
+            client.max_connections = 3
+            responses = await asyncio.gather(*(client.request('GET', f'{url}/{i}') for i in range(12)))
+            self.assertEqual([response.body for response in responses], [f'/{i}'.encode() for i in range(12)])
+            self.assertEqual(server.connections, 3)
+            self.assertEqual(client.get_stats()['idle'], 3)
+        self.run_with_server(test)
+
+
+
+    def test_chunked_and_gzip_bodies(self):
+        async def test(client, server, url):
+            self.assertEqual((await client.request('GET', f'{url}/chunked')).body, b'hello world')
+            self.assertEqual((await client.request('GET', f'{url}/gzip')).body, b'squashed')
+            self.assertEqual((await client.request('GET', f'{url}/after')).body, b'/after')   # nothing was left unread
+            self.assertEqual(server.connections, 1)
+        self.run_with_server(test)
+
+
+
+    def test_chunked_body_cut_short(self):
+        async def test(client, server, url):
+            with self.assertRaises(ConnectionResetError):
+                await client.request('POST', f'{url}/cut')  # not a GET, so it isn't sent again
+            self.assertEqual(client.get_stats()['idle'], 0)     # the broken connection wasn't put back in the pool
+            self.assertEqual((await client.request('GET', f'{url}/after')).body, b'/after')
+            self.assertEqual(server.connections, 2)
+        self.run_with_server(test)
+
+
+
+    def test_stale_connection_is_retried(self):
+        async def test(client, server, url):
+            await client.request('GET', f'{url}/once')
+            await asyncio.sleep(0.1)    # the server has closed it by now, but it's still in the pool
+            connection = client._idle[next(iter(client._idle))][-1]
+            self.assertEqual(client.get_stats()['idle'], 1)
+
+            # pretend the close hasn't been noticed yet, like when the FIN is still on its way
+            usable = type(connection).usable
+            type(connection).usable = lambda self, idle_timeout: True
+            try:
+                response = await client.request('GET', f'{url}/again')
+            finally:
+                type(connection).usable = usable
+            self.assertEqual(response.body, b'/again')
+            self.assertEqual(server.connections, 2)
+            self.assertEqual(client.get_stats()['opened'], 2)
+        self.run_with_server(test)
+
+
+
+    def test_timeout(self):
+        async def test(client, server, url):
+            with self.assertRaises(asyncio.TimeoutError):
+                await client.request('GET', f'{url}/slow')
+            self.assertEqual(client.get_stats()['idle'], 0)     # a connection left mid-response is never reused
+            self.assertEqual((await client.request('GET', f'{url}/slow', timeout=3)).body, b'/slow')
+        self.run_with_server(test)
+
+
+
+    def test_new_event_loop_closes_old_connections(self):
+        client = HTTPClient()
+
+        async def first():
+            server = FakeServer()
+            url = await server.start()
+            await client.request('GET', f'{url}/x')
+            await server.close()
+            return url
+
+        asyncio.run(first())
+        self.assertEqual(client.get_stats()['idle'], 1)
+        old = client._idle[next(iter(client._idle))][0]
+
+        async def second():
+            server = FakeServer()
+            url = await server.start()
+            await client.request('GET', f'{url}/y')
+            await client.close()
+            await server.close()
+
+        asyncio.run(second())
+        self.assertEqual(old.writer.get_extra_info('socket').fileno(), -1)  # its socket was closed, not just forgotten
+        self.assertEqual(client.get_stats()['opened'], 2)
+
+
+
+    def test_bad_url(self):
+        async def test():
+            with self.assertRaises(ValueError):
+                await HTTPClient().request('GET', 'ftp://example.com/')
+        asyncio.run(test())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+tests for Sharding.ShardPool against a stand-in for twitch IRC running on localhost
+run with: python -m unittest discover tests
+"""
+import asyncio
+import collections
+import unittest
+
+from TwitchPy.Commands import Executor, Router
+from TwitchPy.Events import Handler
+from TwitchPy.Sharding import ShardPool
+
+
+
+class QuietLogger:
+    def is_enabled_for(self, level):
+        return False
+
+    async def log(self, level, log_type, msg, exc_info=None):
+        pass
+
+
+
+class Recorder(Handler):
+    def __init__(self):
+        super().__init__()
+        self.handled = collections.Counter()    # {(channel, message): times handled}
+
+    async def on_msg(self, chat):
+        self.handled[(chat.channel, chat.msg)] += 1
+
+
+
+class FakeTMI:
+    """
+    answers the login, JOIN, and PART like twitch does and sends chat messages to every connection in a channel
+    each connection can be given a delay, so the connections aren't in step with each other like on twitch
+    """
+    def __init__(self):
+        self.subscribers = collections.defaultdict(list)    # {channel: [writer]}
+        self.delays = []    # seconds every line to the nth connection is held back
+        self.connections = []
+        self.sent = collections.Counter()   # {channel: messages sent}
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    def _write(self, writer, line: bytes):
+        index = self.connections.index(writer)
+        delay = self.delays[index] if index < len(self.delays) else 0
+        if delay:
+            asyncio.get_running_loop().call_later(delay, writer.write, line)
+        else:
+            writer.write(line)
+
+    async def _handle(self, reader, writer):
+        self.connections.append(writer)
+        for _ in range(3):  # CAP REQ, PASS, NICK
+            await reader.readline()
+        self._write(writer, b':tmi.twitch.tv CAP * ACK :twitch.tv/tags\r\n:tmi.twitch.tv 001 bot :Welcome\r\n')
+        while (line := await reader.readline()):
+            command, _, channel = line.decode().strip().partition(' #')
+            if command == 'JOIN':
+                self.subscribers[channel].append(writer)
+                self._write(writer, f':bot!bot@bot.tmi.twitch.tv JOIN #{channel}\r\n'.encode())
+            elif command == 'PART':
+                self.subscribers[channel].remove(writer)
+                self._write(writer, f':bot!bot@bot.tmi.twitch.tv PART #{channel}\r\n'.encode())
+
+    def chat(self, channel: str):
+        self.sent[channel] += 1
+        n = self.sent[channel]
+        line = f'@id={channel}-{n} :viewer!viewer@viewer.tmi.twitch.tv PRIVMSG #{channel} :{n}\r\n'.encode()
+        for writer in self.subscribers[channel]:
+            self._write(writer, line)
+
+    async def close(self):
+        for writer in self.connections:
+            writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+
+
+
+
+
+class TestShardPool(unittest.TestCase):
+    def setUp(self):
+        self.recorder = Recorder()
+        logger = QuietLogger()
+        self.pool = ShardPool(logger, Router(logger, self.recorder, Executor()), self.recorder, 'oauth:token', 'bot',
+                              'main', None, ['a', 'b'], shards=2)
+        self.pool.interval = 3600    # channels are only moved by the tests
+        self.pool.join_timeout = 2
+        self.tmi = FakeTMI()
+
+        self._open_connection = asyncio.open_connection
+        async def to_fake_tmi(host, port, **kwargs):
+            return await self._open_connection('127.0.0.1', self.port)
+        asyncio.open_connection = to_fake_tmi
+
+    def tearDown(self):
+        asyncio.open_connection = self._open_connection
+
+
+
+    async def _run(self, test):
+        self.port = await self.tmi.start()
+        await self.pool.connect()
+        task = asyncio.create_task(self.pool.run())
+        try:
+            while not all(channel.joined for channel in self.pool.channels.values()):
+                await asyncio.sleep(0.01)
+            await test()
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await self.tmi.close()
+
+
+
+    def test_move_handles_every_message_once(self):
+        """
+        messages keep coming the whole time a channel moves to a shard whose connection is behind the other one's
+        """
+        old = self.pool._shard_of('b')
+        new = next(shard for shard in self.pool.shards if shard is not old)
+        async def test():
+            self.tmi.delays = [0.05 if shard is new else 0 for shard in self.pool.shards]
+            async def chatter():
+                for _ in range(300):
+                    self.tmi.chat('b')
+                    await asyncio.sleep(0.002)
+            talking = asyncio.create_task(chatter())
+            await asyncio.sleep(0.1)
+            await self.pool._move_channel('b', old, new)
+            await talking
+            await asyncio.sleep(0.3)    # let the slower connection catch up
+
+            self.assertIn('b', new.channels)
+            self.assertNotIn('b', old.channels)
+            handled = [count for (channel, _), count in self.recorder.handled.items() if channel == 'b']
+            self.assertEqual(len(handled), self.tmi.sent['b'])     # none missed
+            self.assertEqual(set(handled), {1})                     # none handled twice
+            self.assertEqual(new.channels['b'].messages, self.tmi.sent['b'])
+            self.assertEqual(len(new.channels['b'].chat_history), self.tmi.sent['b'])
+            self.assertEqual(self.pool.moves, 1)
+        asyncio.run(self._run(test))
+
+
+
+    def test_moderator_limit_covers_every_shard(self):
+        """
+        the shards share one limit, so being a moderator on just one shard's channels isn't enough for the higher one
+        """
+        first, second = self.pool.shards
+        for channel in first.channels.values():
+            channel.moderator = True
+        first._update_limit()
+        self.assertEqual([shard.outgoing.limit for shard in self.pool.shards], [20, 20])
+
+        for channel in second.channels.values():
+            channel.moderator = True
+        second._update_limit()
+        self.assertEqual([shard.outgoing.limit for shard in self.pool.shards], [100, 100])
+        self.assertTrue(all(shard.moderator for shard in self.pool.shards))
+
+
+
+if __name__ == '__main__':
+    unittest.main()